@@ -0,0 +1,165 @@
+import io
+import os
+import sys
+import json
+import time
+import signal
+import argparse
+import traceback
+import contextlib
+import concurrent.futures
+
+import cache
+import parser
+import runtime
+
+# Executa muitos programas de uma vez, distribuídos entre processos. Cada
+# processo importa o compilador e monta as tabelas uma só vez, na
+# inicialização, e depois compila e executa um programa por tarefa, com a
+# saída capturada e um tempo limite próprio. O resultado de cada programa é
+# uma linha JSON.
+
+
+class TempoEsgotado(Exception):
+    pass
+
+
+def _alarme(signum, frame):
+    raise TempoEsgotado()
+
+
+def init_worker(opcoes):
+    # Aquece o processo: monta o parser e o lexer antes da primeira tarefa
+    parser.options.update(opcoes)
+    parser.get_parser()
+    from scanner import lexer
+
+
+def run_file(path, timeout=None, usa_cache=True):
+    resultado = {'arquivo': path, 'status': 'ok', 'stdout': '', 'stderr': '', 'erro': None}
+    saida = io.StringIO()
+    erros = io.StringIO()
+    env = {'__name__': '__main__'}
+    stdin = sys.stdin
+    # Programas que usam 'leia' recebem uma entrada vazia em vez de esperar
+    sys.stdin = io.StringIO()
+    limite = timeout and hasattr(signal, 'setitimer')
+    if limite:
+        anterior = signal.signal(signal.SIGALRM, _alarme)
+        signal.setitimer(signal.ITIMER_REAL, timeout)
+    inicio = time.perf_counter()
+    try:
+        with contextlib.redirect_stdout(saida), contextlib.redirect_stderr(erros):
+            with open(path, 'r') as file:
+                data = file.read()
+            compilado = cache.load(path, data, parser.options) if usa_cache else None
+            if compilado is None:
+                compilado = parser.compile_source(data)
+                if usa_cache and compilado[1] is not None:
+                    cache.store(path, data, parser.options, *compilado)
+            mensagens, code = compilado
+            sys.stdout.write(mensagens)
+            if code is None:
+                resultado['status'] = 'erro_sintaxe'
+            else:
+                try:
+                    exec(code, env)
+                finally:
+                    runtime.flush()
+    except TempoEsgotado:
+        resultado['status'] = 'tempo_esgotado'
+        resultado['erro'] = 'passou de {} s'.format(timeout)
+    except Exception as e:
+        excedido = runtime.budget_error(e, '<ast>')
+        if excedido is not None:
+            resultado['status'] = 'limite_excedido'
+            resultado['erro'] = str(excedido)
+        else:
+            resultado['status'] = 'erro'
+            resultado['erro'] = '{}: {}'.format(type(e).__name__, e)
+            erros.write(traceback.format_exc())
+    finally:
+        if limite:
+            signal.setitimer(signal.ITIMER_REAL, 0)
+            signal.signal(signal.SIGALRM, anterior)
+        sys.stdin = stdin
+        # O próximo programa do processo começa com os limites zerados
+        runtime.end_budget()
+    resultado['tempo'] = time.perf_counter() - inicio
+    resultado['stdout'] = saida.getvalue()
+    resultado['stderr'] = erros.getvalue()
+    return resultado
+
+
+def source_files(caminhos):
+    # Arquivos passados diretamente e os arquivos de cada diretório, sem
+    # descer nos subdiretórios (como o __tchescache__)
+    for caminho in caminhos:
+        if os.path.isdir(caminho):
+            for nome in sorted(os.listdir(caminho)):
+                arquivo = os.path.join(caminho, nome)
+                if os.path.isfile(arquivo):
+                    yield arquivo
+        else:
+            yield caminho
+
+
+def run_batch(arquivos, destino, processos=None, timeout=None, usa_cache=True):
+    # Escreve uma linha JSON por programa, na ordem em que terminam.
+    # Retorna a quantidade de programas por status.
+    contagem = {}
+    opcoes = dict(parser.options)
+    with concurrent.futures.ProcessPoolExecutor(processos, initializer=init_worker,
+                                                initargs=(opcoes,)) as executor:
+        tarefas = {executor.submit(run_file, arquivo, timeout, usa_cache): arquivo
+                   for arquivo in arquivos}
+        for tarefa in concurrent.futures.as_completed(tarefas):
+            try:
+                resultado = tarefa.result()
+            except Exception as e:
+                # O processo morreu (por exemplo, sem memória)
+                resultado = {'arquivo': tarefas[tarefa], 'status': 'erro', 'stdout': '',
+                             'stderr': '', 'erro': '{}: {}'.format(type(e).__name__, e),
+                             'tempo': None}
+            contagem[resultado['status']] = contagem.get(resultado['status'], 0) + 1
+            destino.write(json.dumps(resultado, ensure_ascii=False) + '\n')
+    return contagem
+
+
+if __name__ == "__main__":
+    argparser = argparse.ArgumentParser()
+    argparser.add_argument('caminhos', metavar='ARQUIVO_OU_DIRETORIO', nargs='+')
+    argparser.add_argument('-j', '--processos', type=int,
+                           help='quantidade de processos (padrão: um por núcleo)')
+    argparser.add_argument('--timeout', type=float,
+                           help='tempo limite de cada programa, em segundos')
+    argparser.add_argument('--limite-passos', type=int, metavar='PASSOS',
+                           help='interrompe cada programa depois de tantas voltas de laço e chamadas de função')
+    argparser.add_argument('--limite-memoria', type=int, metavar='MB',
+                           help='interrompe cada programa se ele alocar mais que tantos MB')
+    argparser.add_argument('--saida', metavar='ARQUIVO',
+                           help='arquivo JSON lines dos resultados (padrão: saída padrão)')
+    argparser.add_argument('--sem-cache', action='store_true',
+                           help='não usa o cache de programas compilados')
+    argparser.add_argument('--listas-preguicosas', action='store_true',
+                           help='listas "A a B" só são criadas na primeira modificação')
+    argparser.add_argument('-O', dest='otimizacao', type=int, choices=[0, 1, 2], default=1,
+                           help='nível de otimização (padrão: 1)')
+    args = argparser.parse_args()
+    parser.options['lazy_ranges'] = args.listas_preguicosas
+    parser.options['optimize'] = args.otimizacao
+    parser.options['budget'] = parser.budget_option(args.limite_passos, None, args.limite_memoria)
+
+    arquivos = list(source_files(args.caminhos))
+    inicio = time.perf_counter()
+    if args.saida:
+        with open(args.saida, 'w') as destino:
+            contagem = run_batch(arquivos, destino, args.processos, args.timeout, not args.sem_cache)
+    else:
+        contagem = run_batch(arquivos, sys.stdout, args.processos, args.timeout, not args.sem_cache)
+    tempo = time.perf_counter() - inicio
+
+    resumo = ', '.join('{} {}'.format(n, status) for status, n in sorted(contagem.items()))
+    print('{} programas em {:.2f} s ({})'.format(len(arquivos), tempo, resumo), file=sys.stderr)
+    if set(contagem) - {'ok'}:
+        sys.exit(1)
@@ -0,0 +1,648 @@
+import io
+import os
+import sys
+import json
+import time
+import argparse
+import contextlib
+import tempfile
+import subprocess
+import tracemalloc
+
+import parser
+import runtime
+
+# Benchmarks do compilador. Cada benchmark roda em programas gerados de
+# tamanhos crescentes e mostra o tempo por elemento, que deve ficar
+# aproximadamente constante quando o custo é linear.
+
+
+def declarations_program(n):
+    # n declarações seguidas de n usos de cada variável
+    linhas = []
+    for i in range(n):
+        linhas.append('int v{} é {}.'.format(i, i))
+    for i in range(n):
+        linhas.append('v{} é v{} mais 1.'.format(i, i))
+    return '\n'.join(linhas)
+
+
+def best_of(func, repeat):
+    melhor = None
+    for _ in range(repeat):
+        inicio = time.perf_counter()
+        func()
+        tempo = time.perf_counter() - inicio
+        if melhor is None or tempo < melhor:
+            melhor = tempo
+    return melhor
+
+
+def bench_check(tamanhos, repeat=3):
+    print('checagem (visit)')
+    print('{:>8} {:>12} {:>14}'.format('decl.', 'tempo (ms)', 'por decl. (us)'))
+    for n in tamanhos:
+        myast = parser.get_parser().parse(declarations_program(n))
+
+        def check():
+            parser.scope = parser.SymbolTable()
+            myast.visit()
+
+        tempo = best_of(check, repeat)
+        print('{:>8} {:>12.2f} {:>14.2f}'.format(n, tempo * 1e3, tempo / n * 1e6))
+
+
+class LegacyNode:
+    # Layout antigo do parser.Node (com __dict__ e lista de filhos), usado
+    # como referência no benchmark de memória
+    def __init__(self, type, children, leaf, datatype):
+        self.type = type
+        self.children = children
+        self.leaf = leaf
+        self.datatype = datatype
+
+
+def copy_tree(node, cls):
+    # Copia só os nós; as folhas (strings e números) são compartilhadas, então
+    # as duas cópias medem apenas o custo da estrutura
+    children = []
+    for child in node.children:
+        if isinstance(child, parser.Node):
+            child = copy_tree(child, cls)
+        children.append(child)
+    return cls(node.type, children, node.leaf, node.datatype)
+
+
+def expressions_program(n):
+    # n comandos com expressões, blocos e listas
+    linhas = ['int i é 0, x é 1.', 'lista l é 0 a 10.']
+    for k in range(n):
+        linhas.append('se x é menor que {} então x é (x mais {}) vezes 2. e deu.'.format(k, k))
+        linhas.append('l[i] é l[i] mais x.')
+    return '\n'.join(linhas)
+
+
+def allocated(func):
+    # Memória que continua alocada depois de func()
+    tracemalloc.start()
+    antes = tracemalloc.get_traced_memory()[0]
+    result = func()
+    depois = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    return result, depois - antes
+
+
+def bench_memory(tamanhos):
+    print('memória da árvore')
+    print('{:>8} {:>14} {:>14} {:>8}'.format('comandos', 'Node (KiB)', 'antigo (KiB)', 'razão'))
+    p = parser.get_parser()
+    for n in tamanhos:
+        data = expressions_program(n)
+        myast = p.parse(data)
+        _, compacto = allocated(lambda: copy_tree(myast, parser.Node))
+        _, antigo = allocated(lambda: copy_tree(myast, LegacyNode))
+        print('{:>8} {:>14.1f} {:>14.1f} {:>8.2f}'.format(n, compacto / 1024, antigo / 1024, antigo / compacto))
+
+
+def run_parser(args):
+    subprocess.run([sys.executable, PARSER] + args, stdout=subprocess.DEVNULL, check=True)
+
+
+def bench_startup(repeat, limite=None):
+    # Tempo total de "python parser.py" num programa trivial, com o cache
+    # desligado (compila tudo) e com o cache já preenchido
+    print('inicialização')
+    with tempfile.TemporaryDirectory() as diretorio:
+        fonte = os.path.join(diretorio, 'programa')
+        with open(fonte, 'w') as f:
+            f.write('mostra 1.\n')
+        run_parser([fonte])
+
+        tempos = {
+            'sem cache': best_of(lambda: run_parser(['--sem-cache', fonte]), repeat),
+            'com cache': best_of(lambda: run_parser([fonte]), repeat),
+        }
+
+    for nome, tempo in tempos.items():
+        print('{:>12} {:>10.1f} ms'.format(nome, tempo * 1e3))
+
+    if limite is not None and tempos['sem cache'] * 1e3 > limite:
+        print('Inicialização acima do limite de {} ms'.format(limite))
+        return False
+    return True
+
+
+def bench_batch(copias, repeat):
+    # Programas por segundo com o batch.py, para cada quantidade de
+    # processos, contra um "python parser.py" por programa
+    import batch
+    print('lote (programas por segundo)')
+    with tempfile.TemporaryDirectory() as diretorio:
+        arquivos = []
+        for nome in sorted(os.listdir(EXEMPLOS)):
+            origem = os.path.join(EXEMPLOS, nome)
+            if not os.path.isfile(origem):
+                continue
+            with open(origem) as f:
+                data = f.read()
+            for k in range(copias):
+                arquivo = os.path.join(diretorio, '{}-{}'.format(nome, k))
+                with open(arquivo, 'w') as f:
+                    f.write(data)
+                arquivos.append(arquivo)
+
+        def subprocessos():
+            for arquivo in arquivos:
+                subprocess.run([sys.executable, PARSER, '--sem-cache', arquivo], stdin=subprocess.DEVNULL,
+                               stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+
+        tempo = best_of(subprocessos, repeat)
+        print('{:>14} {:>10.1f}'.format('subprocessos', len(arquivos) / tempo))
+        processos = 1
+        while processos <= (os.cpu_count() or 1):
+            tempo = best_of(lambda: batch.run_batch(arquivos, io.StringIO(), processos, 10, False), repeat)
+            print('{:>14} {:>10.1f}'.format('{} processos'.format(processos), len(arquivos) / tempo))
+            processos *= 2
+
+
+def output_program(n):
+    linhas = ['int i é 0.',
+              'enquanto i é menor que {} faça'.format(n),
+              '    mostra i.',
+              '    incrementa i.',
+              'e deu.']
+    return '\n'.join(linhas) + '\n'
+
+
+def bench_output(n, repeat):
+    # 'mostra' por segundo com a saída num pipe, para cada tamanho do buffer
+    # do runtime. Com -u (PYTHONUNBUFFERED) o sys.stdout do Python não
+    # guarda nada e cada escrita do runtime vira uma chamada ao sistema.
+    print('saída ({} "mostra" num pipe, mil linhas por segundo)'.format(n))
+    buffers = [0, 4096, 65536]
+    print('{:<12}'.format('stdout') + ''.join('{:>10}'.format(b) for b in buffers))
+    with tempfile.TemporaryDirectory() as diretorio:
+        fonte = os.path.join(diretorio, 'programa')
+        with open(fonte, 'w') as f:
+            f.write(output_program(n))
+        run_parser([fonte])
+        for nome, ambiente in [('com buffer', {}), ('-u', {'PYTHONUNBUFFERED': '1'})]:
+            env = dict(os.environ, **ambiente)
+            linha = '{:<12}'.format(nome)
+            for tamanho in buffers:
+                def roda():
+                    saida = subprocess.run([sys.executable, PARSER, '--buffer-saida', str(tamanho), fonte],
+                                           stdout=subprocess.PIPE, env=env, check=True).stdout
+                    assert saida.count(b'\n') == n
+                tempo = best_of(roda, repeat)
+                linha += '{:>10.1f}'.format(n / tempo / 1e3)
+            print(linha)
+
+
+PARSER = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'parser.py')
+EXEMPLOS = os.path.join(os.path.dirname(PARSER), 'exemplos')
+
+
+def statements_program(n):
+    linhas = ['int i é 0.']
+    for k in range(n):
+        linhas.append('i é i mais {}.'.format(k))
+    return '\n'.join(linhas)
+
+
+def nesting_program(n):
+    # n blocos 'se' aninhados
+    linhas = ['int i é 0.']
+    for k in range(n):
+        linhas.append('se i é menor que {} então'.format(k + 1))
+    linhas.append('incrementa i.')
+    linhas.extend(['e deu.'] * n)
+    return '\n'.join(linhas)
+
+
+def list_program(n):
+    linhas = [
+        'lista l é 0 a {}.'.format(n),
+        'int soma é 0.',
+        'para v em l faça',
+        '    soma é soma mais v.',
+        'e deu.',
+    ]
+    return '\n'.join(linhas)
+
+
+def sum_loop_program(n):
+    linhas = [
+        'int i é 0, s é 0.',
+        'enquanto i é menor que {} faça'.format(n),
+        '    s é s mais i.',
+        '    incrementa i.',
+        'e deu.',
+    ]
+    return '\n'.join(linhas)
+
+
+def nested_loop_program(n):
+    # Laços aninhados de n iterações no total
+    lado = max(1, int(n ** 0.5))
+    linhas = [
+        'int i é 0, s é 0.',
+        'enquanto i é menor que {} faça'.format(lado),
+        '    int j é 0.',
+        '    enquanto j é menor que {} faça'.format(lado),
+        '        s é s mais i vezes j.',
+        '        incrementa j.',
+        '    e deu.',
+        '    incrementa i.',
+        'e deu.',
+    ]
+    return '\n'.join(linhas)
+
+
+def bubblesort_program(n):
+    # Bubble sort no nível superior, numa lista em ordem decrescente de
+    # tamanho proporcional a raiz de n (o custo é quadrático)
+    tamanho = max(2, int(n ** 0.5))
+    linhas = [
+        'lista l é 0 a {}.'.format(tamanho),
+        'int i é 0, n é {}, mudou é 1.'.format(tamanho),
+        'enquanto i é menor que n faça',
+        '    l[i] é n menos i.',
+        '    incrementa i.',
+        'e deu.',
+        'enquanto mudou é igual a 1 faça',
+        '    mudou é 0.',
+        '    i é 0.',
+        '    enquanto i é menor que n menos 1 faça',
+        '        se l[i] é maior que l[i mais 1] então',
+        '            int temp é l[i].',
+        '            l[i] é l[i mais 1].',
+        '            l[i mais 1] é temp.',
+        '            mudou é 1.',
+        '        e deu.',
+        '        incrementa i.',
+        '    e deu.',
+        '    decrementa n.',
+        'e deu.',
+    ]
+    return '\n'.join(linhas)
+
+
+def tail_call_program(n):
+    # n chamadas de uma função com recursão em cauda de profundidade 100.
+    # A partir do -O1 a recursão vira laço.
+    linhas = [
+        'define conta com int k, int acc como',
+        '    se k é igual a 0 então',
+        '        retorna acc.',
+        '    e deu.',
+        '    retorna conta com k menos 1, acc mais k.',
+        'e deu.',
+        'int i é 0, s é 0.',
+        'enquanto i é menor que {} faça'.format(max(1, n // 100)),
+        '    s é s mais (conta com 100, 0).',
+        '    incrementa i.',
+        'e deu.',
+    ]
+    return '\n'.join(linhas)
+
+
+def call_program(n):
+    # Laço de n iterações que chama uma função pequena. No -O2 a chamada é
+    # trocada pela expressão da função.
+    linhas = [
+        'define soma com int x, int y como',
+        '    retorna x mais y.',
+        'e deu.',
+        'int i é 0, s é 0.',
+        'enquanto i é menor que {} faça'.format(n),
+        '    s é soma com s, i vezes 2.',
+        '    incrementa i.',
+        'e deu.',
+    ]
+    return '\n'.join(linhas)
+
+
+LACOS = {
+    'cauda': tail_call_program,
+    'chamada': call_program,
+    'soma': sum_loop_program,
+    'aninhado': nested_loop_program,
+    'bolha': bubblesort_program,
+}
+
+
+def bench_levels(tamanhos, repeat):
+    # Tempo de execução dos laços em cada nível de otimização. A partir do
+    # -O1 o programa roda dentro de uma função e as variáveis são locais.
+    print('laços por nível de otimização (exec, ms)')
+    niveis = [0, 1, 2]
+    print('{:<18}'.format('programa') + ''.join('{:>10}'.format('-O{}'.format(o)) for o in niveis))
+    original = parser.options['optimize']
+    try:
+        for nome, gerador in sorted(LACOS.items()):
+            for n in tamanhos:
+                data = gerador(n)
+                linha = '{:<18}'.format('{}-{}'.format(nome, n))
+                for nivel in niveis:
+                    parser.options['optimize'] = nivel
+                    mensagens, code = parser.compile_source(data)
+                    tempo = best_of(lambda: exec(code, {'__name__': '__main__'}), repeat)
+                    linha += '{:>10.2f}'.format(tempo * 1e3)
+                print(linha)
+    finally:
+        parser.options['optimize'] = original
+
+
+def bench_budget(tamanhos, repeat):
+    # Custo dos passos contados com --limite-passos nos programas do 'lacos',
+    # no -O1, com um limite que nunca é atingido
+    print('limites de execução (exec, ms)')
+    print('{:<18}{:>10}{:>10}{:>10}'.format('programa', 'sem', 'com', 'custo'))
+    original = parser.options['budget']
+    try:
+        for nome, gerador in sorted(LACOS.items()):
+            for n in tamanhos:
+                data = gerador(n)
+                tempos = []
+                for budget in (None, parser.budget_option(10 ** 12)):
+                    parser.options['budget'] = budget
+                    mensagens, code = parser.compile_source(data)
+                    tempos.append(best_of(lambda: exec(code, {'__name__': '__main__'}), repeat))
+                    runtime.end_budget()
+                print('{:<18}{:>10.2f}{:>10.2f}{:>9.0f}%'.format('{}-{}'.format(nome, n), tempos[0] * 1e3,
+                                                               tempos[1] * 1e3, (tempos[1] / tempos[0] - 1) * 100))
+    finally:
+        parser.options['budget'] = original
+
+
+def random_source(rng, n):
+    # Texto aleatório com os casos difíceis do scanner: números com vírgula,
+    # strings, comentários, caracteres ilegais e quebras de linha
+    pedacos = ['mais', 'x', 'é', 'não', 'então', '1', '23', '4,5', '1,2,3', '1,,2', ',', '.',
+               '"a b"', "'c'", '"', '#', '# nota', '(', ')', '[', ']', '@', '$', '\r', '\n',
+               '\n\n', ' ', '\t', 'ação', 'x1', 'Z', '{', '~', 'ÿ', 'Я', 'я', '0']
+    return ''.join(rng.choice(pedacos) for _ in range(n))
+
+
+def bench_scan(tamanhos, repeat):
+    # Compara scanner.scan() com o lexer do PLY: primeiro a equivalência dos
+    # tokens e mensagens, depois o tempo de varredura
+    import random
+    import scanner
+    textos = []
+    for nome in sorted(os.listdir(EXEMPLOS)):
+        if os.path.isfile(os.path.join(EXEMPLOS, nome)):
+            with open(os.path.join(EXEMPLOS, nome)) as f:
+                textos.append((nome, f.read()))
+    for corpus, gerador in sorted(CORPORA.items()):
+        textos.append((corpus, gerador(PROFUNDIDADES[-1])))
+    rng = random.Random(0)
+    for k in range(500):
+        textos.append(('aleatorio-{}'.format(k), random_source(rng, rng.randint(1, 200))))
+
+    ok = True
+    for nome, data in textos:
+        diferenca = scanner.compare(data)
+        if diferenca is not None:
+            print('{}: token {} difere: PLY {} / scan {}'.format(nome, *diferenca))
+            ok = False
+    print('varredura: {} textos {}'.format(len(textos), 'iguais' if ok else 'com diferenças'))
+
+    print('{:>8} {:>10} {:>12} {:>12} {:>14}'.format('comandos', 'KiB', 'PLY (ms)', 'scan (ms)',
+                                                     'scan+tokens (ms)'))
+    for n in tamanhos:
+        data = expressions_program(n)
+
+        def ply():
+            lexer = scanner.lexer.clone()
+            lexer.input(data)
+            for token in iter(lexer.token, None):
+                pass
+
+        def tokens():
+            for token in iter(scanner.scan(data).token, None):
+                pass
+
+        print('{:>8} {:>10.1f} {:>12.2f} {:>12.2f} {:>14.2f}'.format(
+            n, len(data.encode()) / 1024, best_of(ply, repeat) * 1e3,
+            best_of(lambda: scanner.scan(data), repeat) * 1e3, best_of(tokens, repeat) * 1e3))
+    return ok
+
+
+def editor_program(linhas):
+    # Funções e comandos que usam uma variável 'base' declarada no começo
+    partes = ['int base é 1.']
+    k = 0
+    while len(partes) < linhas:
+        partes.extend([
+            'int v{} é {}.'.format(k, k),
+            'define f{} com int n como'.format(k),
+            '    int s é n mais v{}.'.format(k),
+            '    se s é maior que 10 então',
+            '        s é s menos 1.',
+            '    e deu.',
+            '    retorna s mais base.',
+            'e deu.',
+            'mostra f{} com v{}.'.format(k, k),
+        ])
+        k += 1
+    return '\n'.join(partes) + '\n'
+
+
+def bench_editor(linhas, repeat):
+    # Latência do servidor de linguagem (lsp.py) para uma edição, até as
+    # mensagens estarem prontas para publicar
+    import lsp
+    data = editor_program(linhas)
+    inicio = time.perf_counter()
+    documento = lsp.Document(data)
+    abertura = time.perf_counter() - inicio
+    print('editor ({} linhas, {} segmentos)'.format(len(documento.lines), len(documento.segments)))
+    print('{:<28} {:>12}'.format('abrir o arquivo', '{:.1f} ms'.format(abertura * 1e3)))
+
+    meio = len(documento.lines) // 2
+    while not documento.lines[meio].startswith('    int s'):
+        meio += 1
+    casos = [
+        # (nome, linha, coluna, texto novo, texto que desfaz)
+        ('digitar num define', meio, 20, ' mais 1', ''),
+        ('novo comando', meio - 1, 0, 'mostra v1.\n', ''),
+        ('mudar tipo de uma variável', meio - 2, 0, 'real', 'int'),
+        ('mudar a variável base', 0, 0, 'real', 'int'),
+    ]
+    print('{:<28} {:>12} {:>12} {:>10}'.format('edição', 'mediana (ms)', 'máximo (ms)', 'checados'))
+    for nome, linha, coluna, texto, desfaz in casos:
+        tempos = []
+        for _ in range(max(repeat, 5)):
+            fim = coluna + (len('int') if desfaz else 0)
+            inicio = time.perf_counter()
+            checados = documento.change((linha, coluna), (linha, fim), texto)
+            documento.diagnostics()
+            tempos.append(time.perf_counter() - inicio)
+            # Volta ao texto original
+            novas = texto.count('\n')
+            if novas:
+                documento.change((linha, coluna), (linha + novas, 0), desfaz)
+            else:
+                documento.change((linha, coluna), (linha, coluna + len(texto)), desfaz)
+        tempos.sort()
+        print('{:<28} {:>12.2f} {:>12.2f} {:>10}'.format(nome, tempos[len(tempos) // 2] * 1e3,
+                                                        tempos[-1] * 1e3, checados))
+
+
+PROFUNDIDADES = [10, 25, 50, 100]
+
+CORPORA = {
+    'comandos': statements_program,
+    'aninhamento': nesting_program,
+    'lista': list_program,
+    'identificadores': declarations_program,
+}
+
+
+def phases(data):
+    # Tempo de cada fase do compilador, com as mesmas funções que o
+    # source_tree() usa
+    from scanner import scan
+    tempos = {}
+    saida = io.StringIO()
+    env = {'__name__': '__main__'}
+    # Programas que usam 'leia' recebem zeros
+    stdin = sys.stdin
+    sys.stdin = io.StringIO('0\n' * 100)
+    try:
+        with contextlib.redirect_stdout(saida):
+            inicio = time.perf_counter()
+            tokens = scan(data)
+            tempos['scan'] = time.perf_counter() - inicio
+
+            inicio = time.perf_counter()
+            myast = parser.parse_tokens(tokens)
+            tempos['parse'] = time.perf_counter() - inicio
+            if myast is None:
+                return tempos, 'erro de sintaxe'
+
+            inicio = time.perf_counter()
+            parser.check_tree(myast)
+            tempos['check'] = time.perf_counter() - inicio
+
+            inicio = time.perf_counter()
+            myast = parser.optimize_tree(myast)
+            tempos['opt'] = time.perf_counter() - inicio
+
+            inicio = time.perf_counter()
+            code = compile(parser.module_ast(myast), filename="<ast>", mode="exec")
+            tempos['codegen'] = time.perf_counter() - inicio
+
+            inicio = time.perf_counter()
+            try:
+                exec(code, env)
+            finally:
+                runtime.flush()
+            tempos['exec'] = time.perf_counter() - inicio
+    except Exception as e:
+        return tempos, '{}: {}'.format(type(e).__name__, e)
+    finally:
+        sys.stdin = stdin
+    return tempos, None
+
+
+def best_phases(data, repeat):
+    melhor = {}
+    erro = None
+    for _ in range(repeat):
+        tempos, erro = phases(data)
+        for fase, tempo in tempos.items():
+            if fase not in melhor or tempo < melhor[fase]:
+                melhor[fase] = tempo
+    return melhor, erro
+
+
+def bench_phases(tamanhos, repeat, destino=None):
+    resultados = []
+
+    for nome in sorted(os.listdir(EXEMPLOS)):
+        if not os.path.isfile(os.path.join(EXEMPLOS, nome)):
+            continue
+        with open(os.path.join(EXEMPLOS, nome)) as f:
+            data = f.read()
+        tempos, erro = best_phases(data, repeat)
+        resultados.append({'programa': nome, 'corpus': 'exemplos', 'n': None,
+                           'fases': tempos, 'erro': erro})
+
+    for corpus, gerador in sorted(CORPORA.items()):
+        # A profundidade vira recursão no visit() e no to_python_ast(), então
+        # o aninhamento usa tamanhos menores
+        for n in (PROFUNDIDADES if corpus == 'aninhamento' else tamanhos):
+            tempos, erro = best_phases(gerador(n), repeat)
+            resultados.append({'programa': '{}-{}'.format(corpus, n), 'corpus': corpus, 'n': n,
+                               'fases': tempos, 'erro': erro})
+
+    print('fases (ms)')
+    colunas = ['scan', 'parse', 'check', 'opt', 'codegen', 'exec']
+    print('{:<22}'.format('programa') + ''.join('{:>10}'.format(c) for c in colunas))
+    for r in resultados:
+        linha = '{:<22}'.format(r['programa'])
+        for c in colunas:
+            if c in r['fases']:
+                linha += '{:>10.2f}'.format(r['fases'][c] * 1e3)
+            else:
+                linha += '{:>10}'.format('-')
+        if r['erro']:
+            linha += '  ' + r['erro']
+        print(linha)
+
+    if destino:
+        try:
+            commit = subprocess.run(['git', 'rev-parse', 'HEAD'], cwd=os.path.dirname(PARSER),
+                                    stdout=subprocess.PIPE, stderr=subprocess.DEVNULL,
+                                    universal_newlines=True).stdout.strip()
+        except OSError:
+            commit = None
+        relatorio = {
+            'commit': commit,
+            'python': sys.version.split()[0],
+            'repeat': repeat,
+            'resultados': resultados,
+        }
+        with open(destino, 'w') as f:
+            json.dump(relatorio, f, indent=2, ensure_ascii=False)
+
+
+if __name__ == "__main__":
+    argparser = argparse.ArgumentParser()
+    argparser.add_argument('--tamanhos', type=int, nargs='+',
+                           default=[250, 500, 1000, 2000, 4000])
+    argparser.add_argument('--repeat', type=int, default=3)
+    argparser.add_argument('--limite-ms', type=float,
+                           help='falha se a inicialização sem cache passar deste tempo')
+    argparser.add_argument('--json', metavar='ARQUIVO',
+                           help='salva os resultados do benchmark de fases em JSON')
+    argparser.add_argument('benchmarks', nargs='*',
+                           default=['checagem', 'memoria', 'inicializacao', 'fases'],
+                           help='checagem, memoria, inicializacao, fases, lacos, limites, lote, varredura, editor, saida')
+    args = argparser.parse_args()
+
+    if 'checagem' in args.benchmarks:
+        bench_check(args.tamanhos, args.repeat)
+    if 'memoria' in args.benchmarks:
+        bench_memory(args.tamanhos)
+    if 'lacos' in args.benchmarks:
+        bench_levels(args.tamanhos, args.repeat)
+    if 'limites' in args.benchmarks:
+        bench_budget(args.tamanhos, args.repeat)
+    if 'varredura' in args.benchmarks:
+        if not bench_scan(args.tamanhos, args.repeat):
+            sys.exit(1)
+    if 'editor' in args.benchmarks:
+        bench_editor(10000, args.repeat)
+    if 'saida' in args.benchmarks:
+        bench_output(1000000, args.repeat)
+    if 'lote' in args.benchmarks:
+        bench_batch(10, args.repeat)
+    if 'fases' in args.benchmarks:
+        bench_phases(args.tamanhos, args.repeat, args.json)
+    if 'inicializacao' in args.benchmarks:
+        if not bench_startup(max(args.repeat, 10), args.limite_ms):
+            sys.exit(1)
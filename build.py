@@ -0,0 +1,123 @@
+import os
+import sys
+import ast
+import shutil
+import marshal
+import argparse
+import contextlib
+import importlib.util
+
+import parser
+from batch import source_files
+
+# Compila programas antes da hora. Cada programa vira um módulo Python (.py)
+# ou bytecode (.pyc) que só precisa do runtime.py para rodar: o PLY, o
+# scanner e as tabelas ficam na máquina que compila. O runtime.py é copiado
+# para o diretório de saída.
+
+RUNTIME = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'runtime.py')
+EXTENSAO_FONTE = '.tches'
+
+CABECALHO = '# Gerado pelo build.py a partir de {}. Não edite.\n'
+
+
+def output_path(path, pyc, diretorio=None):
+    base, ext = os.path.splitext(path)
+    if ext != EXTENSAO_FONTE:
+        base = path
+    if diretorio:
+        base = os.path.join(diretorio, os.path.basename(base))
+    return base + ('.pyc' if pyc else '.py')
+
+
+def pyc_bytes(code, mtime, tamanho):
+    # Mesmo formato do py_compile: número mágico, flags (0: validado pela
+    # data), data e tamanho do fonte e o código serializado. Sem um .py ao
+    # lado, o Python não confere a data.
+    cabecalho = bytearray(importlib.util.MAGIC_NUMBER)
+    cabecalho.extend((0).to_bytes(4, 'little'))
+    cabecalho.extend((int(mtime) & 0xFFFFFFFF).to_bytes(4, 'little'))
+    cabecalho.extend((tamanho & 0xFFFFFFFF).to_bytes(4, 'little'))
+    return bytes(cabecalho) + marshal.dumps(code)
+
+
+def build_file(path, pyc=False, diretorio=None):
+    # Retorna o caminho do arquivo gerado, ou None se houve erro de sintaxe.
+    # As mensagens da checagem vão para a saída de erros.
+    with open(path, 'r') as file:
+        data = file.read()
+    # Se a geração de código falhar, as mensagens já escritas pelo
+    # source_tree() também vão para a saída de erros
+    with contextlib.redirect_stdout(sys.stderr):
+        mensagens, tree = parser.source_tree(data)
+    sys.stderr.write(mensagens)
+    if tree is None:
+        return None
+
+    # Compila mesmo gerando .py, para não gravar uma árvore inválida. Com
+    # .pyc os tracebacks apontam para as linhas do programa original.
+    code = compile(tree, filename=path, mode='exec')
+    destino = output_path(path, pyc, diretorio)
+    if pyc:
+        st = os.stat(path)
+        conteudo = pyc_bytes(code, st.st_mtime, st.st_size)
+    else:
+        conteudo = (CABECALHO.format(path) + ast.unparse(tree) + '\n').encode('utf-8')
+
+    temp = '{}.{}.tmp'.format(destino, os.getpid())
+    with open(temp, 'wb') as f:
+        f.write(conteudo)
+    os.replace(temp, destino)
+    return destino
+
+
+def copy_runtime(diretorio):
+    destino = os.path.join(diretorio, 'runtime.py')
+    if os.path.exists(destino) and os.path.samefile(destino, RUNTIME):
+        return
+    shutil.copyfile(RUNTIME, destino)
+
+
+if __name__ == "__main__":
+    argparser = argparse.ArgumentParser()
+    argparser.add_argument('caminhos', metavar='ARQUIVO_OU_DIRETORIO', nargs='+')
+    argparser.add_argument('--pyc', action='store_true',
+                           help='gera bytecode (.pyc) em vez de código Python (.py)')
+    argparser.add_argument('-d', '--diretorio',
+                           help='diretório dos arquivos gerados (padrão: o do programa)')
+    argparser.add_argument('--sem-runtime', action='store_true',
+                           help='não copia o runtime.py para o diretório dos arquivos gerados')
+    argparser.add_argument('--listas-preguicosas', action='store_true',
+                           help='listas "A a B" só são criadas na primeira modificação')
+    argparser.add_argument('--profile', action='store_true',
+                           help='mostra chamadas e tempo das funções e iterações dos laços ao sair')
+    argparser.add_argument('-O', dest='otimizacao', type=int, choices=[0, 1, 2], default=1,
+                           help='nível de otimização (padrão: 1)')
+    args = argparser.parse_args()
+    parser.options['lazy_ranges'] = args.listas_preguicosas
+    parser.options['profile'] = args.profile
+    parser.options['optimize'] = args.otimizacao
+
+    if args.diretorio:
+        os.makedirs(args.diretorio, exist_ok=True)
+    erros = 0
+    diretorios = set()
+    for arquivo in source_files(args.caminhos):
+        try:
+            destino = build_file(arquivo, args.pyc, args.diretorio)
+        except (ValueError, TypeError, SyntaxError) as e:
+            # Árvore que o compile() do Python recusa
+            print('{}: erro na geração de código: {}'.format(arquivo, e), file=sys.stderr)
+            erros += 1
+            continue
+        if destino is None:
+            print('{}: erro de sintaxe, nada foi gerado'.format(arquivo), file=sys.stderr)
+            erros += 1
+        else:
+            diretorios.add(os.path.dirname(os.path.abspath(destino)))
+
+    if not args.sem_runtime:
+        for diretorio in diretorios:
+            copy_runtime(diretorio)
+    if erros:
+        sys.exit(1)
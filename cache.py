@@ -0,0 +1,111 @@
+import hashlib
+import marshal
+import os
+import sys
+
+# Cache em disco dos programas já compilados, no estilo do __pycache__.
+# A chave é o hash do código fonte mais a versão do compilador, então
+# qualquer mudança no fonte, na gramática ou no gerador de código invalida
+# as entradas antigas.
+
+VERSAO = 1
+DIRETORIO = '__tchescache__'
+EXTENSAO = '.tchc'
+TAMANHO_MAXIMO = 32 * 1024 * 1024
+
+# Arquivos que influenciam o código gerado
+ARQUIVOS_COMPILADOR = ['scanner.py', 'parser.py', 'runtime.py']
+
+_versao_compilador = None
+
+
+def compiler_version():
+    global _versao_compilador
+    if _versao_compilador is None:
+        h = hashlib.sha256()
+        h.update('{} {}'.format(VERSAO, sys.implementation.cache_tag).encode())
+        base = os.path.dirname(os.path.abspath(__file__))
+        for nome in ARQUIVOS_COMPILADOR:
+            with open(os.path.join(base, nome), 'rb') as f:
+                h.update(f.read())
+        _versao_compilador = h.hexdigest()
+    return _versao_compilador
+
+
+def cache_dir(path):
+    return os.path.join(os.path.dirname(os.path.abspath(path)), DIRETORIO)
+
+
+def cache_key(data, options):
+    h = hashlib.sha256()
+    h.update(compiler_version().encode())
+    # Opções que mudam o código gerado
+    h.update(repr(sorted(options.items())).encode())
+    h.update(data.encode())
+    return h.hexdigest()
+
+
+def load(path, data, options):
+    # Retorna (mensagens, código) ou None se não estiver no cache
+    entrada = os.path.join(cache_dir(path), cache_key(data, options) + EXTENSAO)
+    try:
+        with open(entrada, 'rb') as f:
+            mensagens, code = marshal.load(f)
+        # Atualiza o mtime para a política de remoção (LRU)
+        os.utime(entrada)
+    except (OSError, EOFError, ValueError, TypeError):
+        return None
+    return mensagens, code
+
+
+def store(path, data, options, mensagens, code):
+    diretorio = cache_dir(path)
+    entrada = os.path.join(diretorio, cache_key(data, options) + EXTENSAO)
+    temp = '{}.{}.tmp'.format(entrada, os.getpid())
+    try:
+        os.makedirs(diretorio, exist_ok=True)
+        with open(temp, 'wb') as f:
+            marshal.dump((mensagens, code), f)
+        os.replace(temp, entrada)
+        evict(diretorio)
+    except OSError:
+        # Diretório sem permissão de escrita: roda sem cache
+        try:
+            os.remove(temp)
+        except OSError:
+            pass
+
+
+def evict(diretorio, limite=TAMANHO_MAXIMO):
+    # Remove as entradas usadas há mais tempo até caber no limite
+    entradas = []
+    total = 0
+    for nome in os.listdir(diretorio):
+        if not nome.endswith(EXTENSAO):
+            continue
+        caminho = os.path.join(diretorio, nome)
+        try:
+            st = os.stat(caminho)
+        except OSError:
+            continue
+        entradas.append((st.st_mtime, st.st_size, caminho))
+        total += st.st_size
+
+    entradas.sort()
+    for mtime, tamanho, caminho in entradas:
+        if total <= limite:
+            break
+        try:
+            os.remove(caminho)
+        except OSError:
+            pass
+        total -= tamanho
+
+
+def clear(path):
+    diretorio = cache_dir(path)
+    if not os.path.isdir(diretorio):
+        return
+    for nome in os.listdir(diretorio):
+        if nome.endswith(EXTENSAO):
+            os.remove(os.path.join(diretorio, nome))
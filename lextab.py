@@ -0,0 +1,10 @@
+# lextab.py. This file automatically created by PLY (version 3.10). Don't edit!
+_tabversion   = '3.10'
+_lextokens    = set(('KW_GREATER', 'OP_BY', 'BRACKET_OPEN', 'STRING', 'KW_RETURN', 'KW_PARALLEL', 'KW_FUNCTION', 'KW_EQUAL', 'OP_INC', 'FALSE', 'KW_ITS', 'KW_OF', 'OP_MUL', 'KW_IF_OPEN', 'OP_SUB', 'KW_PRINT', 'KW_FLOAT', 'KW_IS', 'KW_FOR', 'KW_DONE', 'KW_WHILE', 'KW_TO', 'PAR_OPEN', 'KW_IF', 'KW_FUNC_OPEN', 'KW_OR', 'KW_STRING', 'FLOAT_NUMBER', 'KW_THAN', 'KW_OK', 'KW_LOOP_OPEN', 'KW_INT', 'INT_NUMBER', 'KW_AND', 'IDENTIFIER', 'KW_NOT', 'KW_DIFF', 'KW_LIST', 'TRUE', 'KW_FPUNC', 'OP_DEC', 'KW_ELSE', 'KW_INPUT', 'KW_PUT', 'KW_MEMO', 'KW_FUNC_ARGS_SEP', 'BRACKET_CLOSE', 'PAR_CLOSE', 'OP_EXP', 'KW_EACH', 'KW_LESS', 'KW_IN', 'KW_FUNC_OPEN_ARGS', 'OP_ADD', 'OP_DIV'))
+_lexreflags   = 64
+_lexliterals  = ''
+_lexstateinfo = {'INITIAL': 'inclusive'}
+_lexstatere   = {'INITIAL': [('(?P<t_IDENTIFIER>[a-Я][a-Я0-9]*)|(?P<t_STRING>\\".*\\"|\\\'.*\\\')|(?P<t_float_error>([0-9]+,[0-9]*,[0-9]+)+)|(?P<t_FLOAT_NUMBER>[0-9]+,[0-9]+)|(?P<t_INT_NUMBER>[0-9]+)|(?P<t_NEW_LINE>\\n+)|(?P<t_COMMENT>\\#.*)|(?P<t_PAR_OPEN>\\()|(?P<t_PAR_CLOSE>\\))|(?P<t_BRACKET_OPEN>\\[)|(?P<t_BRACKET_CLOSE>\\])|(?P<t_KW_FPUNC>\\.)|(?P<t_KW_FUNC_ARGS_SEP>,)', [None, ('t_IDENTIFIER', 'IDENTIFIER'), ('t_STRING', 'STRING'), ('t_float_error', 'float_error'), None, ('t_FLOAT_NUMBER', 'FLOAT_NUMBER'), ('t_INT_NUMBER', 'INT_NUMBER'), ('t_NEW_LINE', 'NEW_LINE'), ('t_COMMENT', 'COMMENT'), (None, 'PAR_OPEN'), (None, 'PAR_CLOSE'), (None, 'BRACKET_OPEN'), (None, 'BRACKET_CLOSE'), (None, 'KW_FPUNC'), (None, 'KW_FUNC_ARGS_SEP')])]}
+_lexstateignore = {'INITIAL': ' \t'}
+_lexstateerrorf = {'INITIAL': 't_error'}
+_lexstateeoff = {}
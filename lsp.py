@@ -0,0 +1,417 @@
+import io
+import re
+import sys
+import json
+import contextlib
+
+import parser
+from scanner import lexer, scan
+
+# Servidor de linguagem (LSP) pela entrada e saída padrão. O documento fica
+# dividido em segmentos de linhas inteiras que terminam em um comando de
+# nível superior completo (um comando, um bloco 'define', ...). Uma edição
+# só divide e analisa de novo os segmentos que ela toca; a checagem só roda
+# de novo nos segmentos que usam algum nome que o trecho editado declara ou
+# declarava, e só se o escopo que eles veem mudou.
+
+SEVERIDADE_ERRO = 1
+SEVERIDADE_AVISO = 2
+
+# Mensagens do visit() que não impedem a compilação
+AVISOS = ('vai rodar em sequência', 'não pode ser memorizada')
+
+_NA_LINHA = re.compile(r'na linha (\d+)')
+_NAO_DEFINIDO = re.compile(r'^(\S+) não foi definido$')
+
+# Nome sem declaração antes do segmento
+AUSENTE = object()
+
+
+class Segment:
+    __slots__ = ('start', 'count', 'index', 'text', 'tree', 'parse_messages', 'refs', 'first_use',
+                 'first', 'last', 'declared', 'functions', 'key', 'messages')
+
+    def __init__(self, lines, start, count):
+        self.start = start
+        self.count = count
+        self.index = 0
+        self.text = ''.join(lines[start:start + count])
+        self.key = None
+        self.messages = []
+        self.tokens()
+        self.parse()
+
+    def tokens(self):
+        # Identificadores usados (as dependências do segmento), a primeira
+        # posição de cada um e as linhas do primeiro e do último token, todas
+        # relativas ao começo do segmento
+        self.refs = set()
+        self.first_use = {}
+        self.first = self.last = None
+        with contextlib.redirect_stdout(io.StringIO()):
+            for tok in scan(self.text).tokens():
+                coluna = tok.lexpos - self.text.rfind('\n', 0, tok.lexpos) - 1
+                if self.first is None:
+                    self.first = tok.lineno - 1
+                self.last = tok.lineno - 1
+                if tok.type == 'IDENTIFIER':
+                    self.refs.add(tok.value)
+                    if tok.value not in self.first_use:
+                        self.first_use[tok.value] = (tok.lineno - 1, coluna, coluna + len(tok.value))
+        self.refs = tuple(sorted(self.refs))
+
+    def parse(self):
+        # A árvore fica como o parser gerou; o visit() roda numa cópia
+        self.tree = None
+        self.parse_messages = []
+        self.declared = {}
+        self.functions = []
+        if self.first is None:
+            # Só linhas vazias e comentários
+            return
+        saida = io.StringIO()
+        with contextlib.redirect_stdout(saida):
+            self.tree = parser.get_parser().parse(lexer=lexer, tokenfunc=scan(self.text).token)
+        self.parse_messages = saida.getvalue().splitlines()
+        if self.tree is None:
+            return
+        # Declarações de nível superior, que continuam no escopo depois do
+        # segmento, e funções 'define'
+        stack = list(reversed(self.tree.children))
+        while stack:
+            node = stack.pop()
+            if not isinstance(node, parser.Node):
+                continue
+            if node.type == 'declaracao':
+                tipo = node.leaf
+                atribuicoes = [node.children[0]]
+                while atribuicoes:
+                    n = atribuicoes.pop()
+                    if n.type == 'atribuicao':
+                        self.declared[n.children[0]] = tipo
+                    elif n.type == 'lista_atribuicoes':
+                        atribuicoes.extend(reversed(n.children))
+            elif node.type == 'funcao':
+                self.functions.append(node.leaf)
+
+    def names(self):
+        # Nomes que este segmento oferece aos outros
+        return set(self.declared) | set(self.functions)
+
+
+class Document:
+    def __init__(self, text):
+        self.lines = split_lines(text)
+        self.segments = []
+        self.declarations = {}
+        self.references = {}
+        self.function_defs = {}
+        # Funções 'define' do documento: nome -> nó 'funcao'
+        self.functions = {}
+        novos = list(self.split(0))
+        self.replace(0, 0, novos)
+
+    def split(self, start):
+        # Gera os segmentos a partir da linha start, que deve ser o começo de
+        # um segmento. Um segmento termina no fim de uma linha em que não
+        # sobrou nenhum token depois do último comando completo.
+        depth = 0
+        last = None
+        inicio = start
+        tokens = False
+        aberto = False
+        for n in range(start, len(self.lines)):
+            ends, depth, last, pending = parser.split_line(self.lines[n], depth, last)
+            tokens = tokens or bool(ends) or pending
+            aberto = pending if ends else (aberto or pending)
+            if tokens and not aberto:
+                yield inicio, n + 1 - inicio
+                inicio = n + 1
+                depth = 0
+                last = None
+                tokens = False
+        if inicio < len(self.lines):
+            yield inicio, len(self.lines) - inicio
+
+    def replace(self, i, k, limites):
+        # Troca os segmentos i..k-1 pelos segmentos novos e checa de novo o
+        # que depende deles
+        novos = [Segment(self.lines, start, count) for start, count in limites]
+        removidos = self.segments[i:k]
+        self.segments[i:k] = novos
+
+        alterados = set()
+        for seg in removidos:
+            alterados |= seg.names()
+            for name in seg.refs:
+                self.references[name].discard(seg)
+            for name in seg.declared:
+                self.declarations[name].remove(seg)
+            for name in seg.functions:
+                self.function_defs[name].remove(seg)
+        for seg in novos:
+            alterados |= seg.names()
+            for name in seg.refs:
+                self.references.setdefault(name, set()).add(seg)
+            for name in seg.declared:
+                self.declarations.setdefault(name, []).append(seg)
+            for name in seg.functions:
+                self.function_defs.setdefault(name, []).append(seg)
+
+        # Posições e linhas dos segmentos seguintes
+        linha = self.segments[i - 1].start + self.segments[i - 1].count if i else 0
+        for index in range(i, len(self.segments)):
+            seg = self.segments[index]
+            seg.index = index
+            seg.start = linha
+            linha += seg.count
+
+        for name in alterados:
+            segs = self.function_defs.get(name)
+            if segs:
+                node = max(segs, key=lambda s: s.index).tree
+                self.functions[name] = next(n for n in node.children
+                                            if isinstance(n, parser.Node) and n.type == 'funcao' and n.leaf == name)
+            else:
+                self.functions.pop(name, None)
+
+        checar = set(novos)
+        for name in alterados:
+            checar |= self.references.get(name, set())
+        for seg in checar:
+            self.check(seg)
+        return len(checar)
+
+    def declared_before(self, name, index):
+        # Tipo da última declaração de nível superior de name antes do
+        # segmento index
+        melhor = None
+        for seg in self.declarations.get(name, ()):
+            if seg.index < index and (melhor is None or seg.index > melhor.index):
+                melhor = seg
+        if melhor is None:
+            return AUSENTE
+        return melhor.declared[name]
+
+    def check(self, seg):
+        if seg.tree is None:
+            seg.messages = []
+            return
+        tipos = tuple(self.declared_before(name, seg.index) for name in seg.refs)
+        key = (tipos, tuple(name in self.functions for name in seg.refs))
+        if key == seg.key:
+            return
+        seg.key = key
+        parser.functions = self.functions
+        parser.scope = parser.SymbolTable()
+        for name, tipo in zip(seg.refs, tipos):
+            if tipo is not AUSENTE:
+                parser.scope.declare(name, tipo)
+        saida = io.StringIO()
+        with contextlib.redirect_stdout(saida):
+            # O visit() marca os nós (tipos das expressões, laços, funções
+            # memorizadas), então cada checagem usa uma cópia nova
+            copy_tree(seg.tree).visit()
+        seg.messages = saida.getvalue().splitlines()
+
+    def change(self, inicio, fim, text):
+        # Troca o texto entre (linha, coluna) inicio e fim, com as colunas
+        # contadas em caracteres
+        (sl, sc), (el, ec) = inicio, fim
+        antigas = len(self.lines)
+        prefixo = self.lines[sl][:sc] if sl < len(self.lines) else ''
+        sufixo = self.lines[el][ec:] if el < len(self.lines) else ''
+        novas = split_lines(prefixo + text + sufixo)
+        if sufixo.endswith('\n') and novas and novas[-1] == '':
+            novas.pop()
+        self.lines[sl:el + 1] = novas
+        delta = len(self.lines) - antigas
+
+        # Segmentos tocados pela edição (em linhas antigas)
+        i = self.segment_at(sl)
+        j = self.segment_at(el)
+        inicio_regiao = self.segments[i].start if self.segments else 0
+        fim_regiao = (self.segments[j].start + self.segments[j].count if self.segments else 0) + delta
+
+        # Divide de novo a partir do segmento i até um limite que coincida com
+        # o começo de um segmento antigo
+        limites = []
+        k = j + 1
+        for start, count in self.split(inicio_regiao):
+            limites.append((start, count))
+            fim = start + count
+            if fim < fim_regiao:
+                continue
+            while k < len(self.segments) and self.segments[k].start + delta < fim:
+                k += 1
+            if k < len(self.segments) and self.segments[k].start + delta == fim:
+                break
+        else:
+            k = len(self.segments)
+        return self.replace(i, k, limites)
+
+    def segment_at(self, linha):
+        # Índice do segmento que contém a linha (ou o último)
+        baixo, alto = 0, len(self.segments) - 1
+        while baixo < alto:
+            meio = (baixo + alto + 1) // 2
+            if self.segments[meio].start <= linha:
+                baixo = meio
+            else:
+                alto = meio - 1
+        return max(baixo, 0)
+
+    def diagnostics(self):
+        result = []
+        for seg in self.segments:
+            for message in seg.parse_messages + seg.messages:
+                result.append(self.diagnostic(seg, message))
+        return result
+
+    def diagnostic(self, seg, message):
+        severidade = SEVERIDADE_AVISO if any(a in message for a in AVISOS) else SEVERIDADE_ERRO
+        m = _NAO_DEFINIDO.match(message)
+        linha = _NA_LINHA.search(message)
+        if m and m.group(1) in seg.first_use:
+            rel, inicio, fim = seg.first_use[m.group(1)]
+            intervalo = self.range(seg.start + rel, inicio, seg.start + rel, fim)
+        elif linha:
+            n = seg.start + int(linha.group(1)) - 1
+            intervalo = self.range(n, 0, n, None)
+            # O segmento foi analisado a partir da linha 1
+            message = _NA_LINHA.sub('na linha {}'.format(n + 1), message)
+        else:
+            intervalo = self.range(seg.start + seg.first, 0, seg.start + seg.last, None)
+        return {'range': intervalo, 'severity': severidade, 'source': 'tchescripta', 'message': message}
+
+    def range(self, sl, sc, el, ec):
+        linha = self.lines[el] if el < len(self.lines) else ''
+        if ec is None:
+            ec = len(linha.rstrip('\n'))
+        return {'start': {'line': sl, 'character': utf16_column(self.lines[sl], sc)},
+                'end': {'line': el, 'character': utf16_column(linha, ec)}}
+
+
+def copy_tree(node):
+    children = [copy_tree(c) if isinstance(c, parser.Node) else c for c in node.children]
+    return parser.Node(node.type, children, node.leaf, node.datatype, node.lineno)
+
+
+def split_lines(text):
+    # Linhas com o '\n' do fim; a última pode ser vazia
+    partes = text.split('\n')
+    return [p + '\n' for p in partes[:-1]] + [partes[-1]]
+
+
+def utf16_column(line, coluna):
+    # O LSP conta as colunas em unidades UTF-16
+    if line.isascii():
+        return coluna
+    return len(line[:coluna].encode('utf-16-le')) // 2
+
+
+def character_column(line, unidades):
+    if line.isascii():
+        return unidades
+    coluna = 0
+    for c in line:
+        if unidades <= 0:
+            break
+        unidades -= 2 if ord(c) > 0xFFFF else 1
+        coluna += 1
+    return coluna
+
+
+def read_message(stream):
+    tamanho = None
+    while True:
+        header = stream.readline()
+        if not header:
+            return None
+        header = header.strip()
+        if not header:
+            break
+        nome, _, valor = header.decode('ascii').partition(':')
+        if nome.lower() == 'content-length':
+            tamanho = int(valor)
+    return json.loads(stream.read(tamanho).decode('utf-8'))
+
+
+def send_message(stream, message):
+    body = json.dumps(message, ensure_ascii=False).encode('utf-8')
+    stream.write('Content-Length: {}\r\n\r\n'.format(len(body)).encode('ascii') + body)
+    stream.flush()
+
+
+class Server:
+    def __init__(self, saida):
+        self.saida = saida
+        self.documents = {}
+        self.shutdown = False
+
+    def publish(self, uri, version=None):
+        params = {'uri': uri, 'diagnostics': self.documents[uri].diagnostics()}
+        if version is not None:
+            params['version'] = version
+        send_message(self.saida, {'jsonrpc': '2.0', 'method': 'textDocument/publishDiagnostics',
+                                  'params': params})
+
+    def handle(self, message):
+        # Retorna False depois do 'exit'
+        method = message.get('method')
+        params = message.get('params') or {}
+        result = None
+        if method == 'initialize':
+            result = {'capabilities': {'textDocumentSync': {'openClose': True, 'change': 2}},
+                      'serverInfo': {'name': 'tchescripta'}}
+        elif method == 'shutdown':
+            self.shutdown = True
+        elif method == 'exit':
+            return False
+        elif method == 'textDocument/didOpen':
+            doc = params['textDocument']
+            self.documents[doc['uri']] = Document(doc['text'])
+            self.publish(doc['uri'], doc.get('version'))
+        elif method == 'textDocument/didChange':
+            doc = params['textDocument']
+            for mudanca in params['contentChanges']:
+                if 'range' in mudanca:
+                    self.edit(doc['uri'], mudanca['range'], mudanca['text'])
+                else:
+                    self.documents[doc['uri']] = Document(mudanca['text'])
+            self.publish(doc['uri'], doc.get('version'))
+        elif method == 'textDocument/didClose':
+            uri = params['textDocument']['uri']
+            self.documents.pop(uri, None)
+            send_message(self.saida, {'jsonrpc': '2.0', 'method': 'textDocument/publishDiagnostics',
+                                      'params': {'uri': uri, 'diagnostics': []}})
+        elif 'id' in message:
+            send_message(self.saida, {'jsonrpc': '2.0', 'id': message['id'],
+                                      'error': {'code': -32601, 'message': 'método desconhecido: {}'.format(method)}})
+            return True
+
+        if 'id' in message:
+            send_message(self.saida, {'jsonrpc': '2.0', 'id': message['id'], 'result': result})
+        return True
+
+    def edit(self, uri, intervalo, text):
+        document = self.documents[uri]
+        posicoes = []
+        for ponto in (intervalo['start'], intervalo['end']):
+            linha = ponto['line']
+            texto_linha = document.lines[linha] if linha < len(document.lines) else ''
+            posicoes.append((linha, character_column(texto_linha, ponto['character'])))
+        document.change(posicoes[0], posicoes[1], text)
+
+
+def serve(entrada, saida):
+    server = Server(saida)
+    while True:
+        message = read_message(entrada)
+        if message is None or not server.handle(message):
+            break
+    return 0 if server.shutdown else 1
+
+
+if __name__ == "__main__":
+    sys.exit(serve(sys.stdin.buffer, sys.stdout.buffer))
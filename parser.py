@@ -1,22 +1,523 @@
+import os
 import sys
-from ply import yacc
-from scanner import tokens
+import io
 import ast
-
-scope = []
+import math
+import operator
+import contextlib
+import cache
+
+class SymbolTable:
+    # Tabela de símbolos com uma pilha de declarações por nome. Cada escopo
+    # guarda só os nomes declarados nele, então entrar e sair de um escopo e
+    # procurar um nome não dependem de quantas variáveis já existem.
+    def __init__(self):
+        self.symbols = {}
+        self.frames = [[]]
+
+    def push(self):
+        self.frames.append([])
+
+    def pop(self):
+        for name in self.frames.pop():
+            stack = self.symbols[name]
+            stack.pop()
+            if not stack:
+                del self.symbols[name]
+
+    def declare(self, name, datatype):
+        self.symbols.setdefault(name, []).append(datatype)
+        self.frames[-1].append(name)
+
+    def __contains__(self, name):
+        return name in self.symbols
+
+    def lookup(self, name, default=None):
+        stack = self.symbols.get(name)
+        if stack:
+            return stack[-1]
+        return default
+
+
+scope = SymbolTable()
 t = ""
 
+# Funções declaradas com 'define' fora de outras funções: nome -> nó 'funcao'
+functions = {}
+# Nomes das funções 'define' aninhadas visíveis no ponto da checagem ou da
+# geração de código, um conjunto por função em que se está dentro
+local_functions = []
+
+# Opções de geração de código, ajustadas pela linha de comando
+options = {
+    'lazy_ranges': False,
+    'profile': False,
+    'optimize': 1,
+    # (passos, segundos, bytes) dos limites de execução, ou None
+    'budget': None,
+}
+
+# Nome do módulo de runtime dentro do código gerado
+RUNTIME = '_tches'
+# Função que recebe o programa principal
+MAIN = '_main'
+
+
+def runtime_call(name, args):
+    func = ast.Attribute(ast.Name(RUNTIME, ast.Load()), name, ast.Load())
+    return ast.Call(func, args, [])
+
+
+def located(node, lineno):
+    # Usa a linha do código fonte no nó gerado; o fix_missing_locations()
+    # repassa a mesma linha para os filhos
+    if lineno:
+        node.lineno = node.end_lineno = lineno
+    return node
+
+
+def budget_step(lineno):
+    # _passo(_passos): um passo do limite de execução, com a linha do laço
+    # ou da função para a mensagem de limite excedido
+    step = ast.Call(ast.Name('_passo', ast.Load()), [ast.Name('_passos', ast.Load())], [])
+    return located(ast.Expr(step), lineno)
+
+
+def loop_counter(kind, lineno, amount=None):
+    # _tches.loop_counts[(kind, lineno)] += 1
+    counts = ast.Attribute(ast.Name(RUNTIME, ast.Load()), 'loop_counts', ast.Load())
+    key = ast.Tuple([ast.Str(kind), ast.Num(lineno or 0)], ast.Load())
+    target = ast.Subscript(counts, ast.Index(key), ast.Store())
+    return ast.AugAssign(target, ast.Add(), amount or ast.Num(1))
+
+
+# Listas tipadas: tipo da lista -> tipo dos elementos. Os elementos ficam
+# num array.array com o código de tipo correspondente.
+ELEMENT_TYPES = {
+    'lista de int': 'int',
+    'lista de real': 'real',
+}
+
+TYPECODES = {
+    'int': 'q',
+    'real': 'd',
+}
+
+
+def expr_type(node):
+    # Tipo de uma expressão já visitada
+    if node.type == 'id':
+        return scope.lookup(node.leaf, '')
+    return node.datatype
+
+
+def accepts(element_type, val_type):
+    # Se um valor do tipo val_type pode ser guardado numa lista tipada
+    if not val_type or val_type == element_type:
+        return True
+    return element_type == 'real' and val_type == 'int'
+
+
+# Funções pré-definidas chamadas com 'com', como as do usuário. Uma função
+# 'define' com o mesmo nome tem prioridade.
+# nome -> (função no runtime, tipos dos argumentos, tipo do resultado)
+# 'lista' aceita qualquer lista e 'elemento' é o tipo dos elementos da lista
+# do primeiro argumento.
+BUILTINS = {
+    'ordena': ('sort', ('lista',), None),
+    'soma': ('total', ('lista',), 'elemento'),
+    'maximo': ('maximum', ('lista',), 'elemento'),
+    'minimo': ('minimum', ('lista',), 'elemento'),
+    'tamanho': ('length', ('lista',), 'int'),
+    'busca': ('search', ('lista', 'elemento'), 'int'),
+    'preenche': ('fill', ('lista', 'elemento'), None),
+    'copia': ('copy', ('lista',), 'lista'),
+}
+
+LIST_TYPES = ('lista',) + tuple(ELEMENT_TYPES)
+# Funções pré-definidas que alteram a lista do primeiro argumento
+MUTATING_BUILTINS = ('ordena', 'preenche')
+
+
+def is_builtin(name):
+    return name in BUILTINS and name not in functions and \
+        not any(name in names for names in local_functions)
+
+
+def nested_functions(funcao):
+    # Nomes das funções 'define' declaradas no corpo da função, sem entrar
+    # nas funções de dentro delas
+    names = set()
+    stack = list(funcao.children)
+    while stack:
+        node = stack.pop()
+        if not isinstance(node, Node):
+            continue
+        if node.type == 'funcao':
+            names.add(node.leaf)
+        else:
+            stack.extend(node.children)
+    return names
+
+
+def args_list(node):
+    # Argumentos de uma chamada como lista de nós
+    args = []
+    while node.type == 'lista_args':
+        args.append(node.children[1])
+        node = node.children[0]
+    args.append(node)
+    return args[::-1]
+
+
+def check_builtin(name, arg_types):
+    # Confere os argumentos de uma função pré-definida e retorna o tipo do
+    # resultado
+    func, expected, result = BUILTINS[name]
+    if len(arg_types) != len(expected):
+        print('{} recebe {} argumento(s), mas recebeu {}.'.format(name, len(expected), len(arg_types)))
+        return None
+
+    list_type = arg_types[0]
+    element_type = ELEMENT_TYPES.get(list_type)
+    for tipo, val_type in zip(expected, arg_types):
+        if tipo == 'lista':
+            if val_type and val_type not in LIST_TYPES:
+                print('A função {} não aceita o tipo {}.'.format(name, val_type))
+        elif element_type and not accepts(element_type, val_type):
+            print('A função {} não aceita o tipo {}.'.format(name, val_type))
+
+    if result == 'elemento':
+        return element_type
+    elif result == 'lista':
+        return list_type or None
+    return result
+
+
+# Otimizações (Node.optimize)
+
+LITERALS = ('valor_int', 'valor_real', 'valor_texto', 'valor_bool')
+
+# Funções pequenas copiadas para o lugar das chamadas no -O2:
+# nome -> (parâmetros, expressão do 'retorna')
+inlinable = {}
+# Nós que a expressão de uma função copiada pode ter, e quantos no máximo
+INLINE_TYPES = LITERALS + ('id', 'paren', 'bin_op', 'comp_op', 'log_op', 'vetor', 'indice',
+                           'func_com', 'lista_args')
+INLINE_MAX_NODES = 16
+
+FOLD = {
+    'mais': operator.add,
+    'menos': operator.sub,
+    'vezes': operator.mul,
+    'dividido_por': operator.truediv,
+    'na': operator.pow,
+    'e': lambda a, b: a and b,
+    'ou': lambda a, b: a or b,
+    'não': operator.not_,
+    'é_igual_a': operator.eq,
+    'é_diferente_de': operator.ne,
+    'é_menor_que': operator.lt,
+    'é_menor_ou_igual_a': operator.le,
+    'é_maior_que': operator.gt,
+    'é_maior_ou_igual_a': operator.ge,
+}
+
+# Resultados maiores que isso ficam para a execução, para não inchar o código
+MAX_FOLD_BITS = 256
+MAX_FOLD_TEXT = 4096
+
+
+def literal_value(node):
+    if node.type == 'valor_bool':
+        return node.leaf == 'verdadeiro'
+    return node.leaf
+
+
+def fold_too_big(op, a, b):
+    # Estima o tamanho do resultado antes de calcular: '10 na 10 na 10' ou
+    # '"ab" vezes 300000000' travariam ou esgotariam a memória da compilação
+    if op == 'na' and type(a) is int and type(b) is int and abs(a) > 1:
+        return a.bit_length() * b > MAX_FOLD_BITS
+    if op == 'vezes' and isinstance(b, str):
+        a, b = b, a
+    if op == 'vezes' and isinstance(a, str) and type(b) is int:
+        return len(a) * b > MAX_FOLD_TEXT
+    return False
+
+
+def literal_node(value):
+    # Nó literal equivalente a um valor calculado em tempo de compilação, ou
+    # None se o valor não deve virar constante
+    if isinstance(value, bool):
+        return Node('valor_bool', leaf='verdadeiro' if value else 'falso', datatype='bool')
+    elif isinstance(value, int):
+        if value.bit_length() <= MAX_FOLD_BITS:
+            return Node('valor_int', leaf=value, datatype='int')
+    elif isinstance(value, float):
+        if math.isfinite(value):
+            return Node('valor_real', leaf=value, datatype='real')
+    elif isinstance(value, str):
+        if len(value) <= MAX_FOLD_TEXT:
+            return Node('valor_texto', leaf=value, datatype='texto')
+    return None
+
+
+def constant_test(node):
+    # Expressão de um nó 'teste', se for constante
+    expr = node.children[0]
+    if isinstance(expr, Node) and expr.type in LITERALS:
+        return expr
+    return None
+
+
+def assigned_names(node):
+    # Nomes que recebem valor em algum ponto da subárvore
+    names = set()
+    stack = [node]
+    while stack:
+        node = stack.pop()
+        if node.type in ('acao_atribuicao', 'atribuicao', 'definicao_loop', 'var'):
+            names.add(node.children[0])
+        elif node.type == 'unary_op':
+            names.add(node.children[0].leaf)
+        stack.extend(c for c in node.children if isinstance(c, Node))
+    return names
+
+
+def shared_writes(corpo, loop_var):
+    # Nomes de fora do laço que o corpo altera. Valem só as variáveis
+    # declaradas dentro do corpo e a variável do laço.
+    locais = {loop_var}
+    escritas = set()
+    stack = [corpo]
+    while stack:
+        node = stack.pop()
+        if node.type in ('atribuicao', 'definicao_loop', 'var'):
+            locais.add(node.children[0])
+        elif node.type == 'acao_atribuicao':
+            escritas.add(node.children[0])
+        elif node.type == 'unary_op' and node.children[0].type == 'id':
+            escritas.add(node.children[0].leaf)
+        elif node.type == 'func_com' and node.leaf in MUTATING_BUILTINS and is_builtin(node.leaf):
+            # 'ordena com o.' e 'preenche com o, x.' alteram a lista o
+            args = args_list(node.children[0])
+            if args and args[0].type == 'id':
+                escritas.add(args[0].leaf)
+        stack.extend(c for c in node.children if isinstance(c, Node))
+    return sorted(escritas - locais)
+
+
+def list_params(funcao):
+    # Nomes dos parâmetros do tipo lista de uma função 'define'
+    if len(funcao.children) < 2:
+        return []
+    names = []
+    stack = [funcao.children[0]]
+    while stack:
+        node = stack.pop()
+        if node.type == 'var':
+            if node.leaf in LIST_TYPES:
+                names.append(node.children[0])
+        else:
+            stack.extend(c for c in node.children if isinstance(c, Node))
+    return names
+
+
+def memo_problems(funcao):
+    # Motivos que impedem memorizar a função: o resultado guardado só vale
+    # se a chamada não tem efeitos além de retornar o valor
+    listas = list_params(funcao)
+    problems = []
+    stack = [funcao.children[-1]]
+    while stack:
+        node = stack.pop()
+        if node.type == 'func':
+            problems.append('usa {}'.format(node.children[0]))
+        elif node.type == 'acao_atribuicao' and len(node.children) > 2 and node.children[0] in listas:
+            problems.append('altera a lista {}'.format(node.children[0]))
+        elif node.type == 'func_com' and node.leaf in MUTATING_BUILTINS and is_builtin(node.leaf):
+            args = args_list(node.children[0])
+            if args and args[0].type == 'id' and args[0].leaf in listas:
+                problems.append('altera a lista {}'.format(args[0].leaf))
+        elif node.type == 'para_paralelo':
+            var, lista = node.children[0].children
+            if lista in listas and var in assigned_names(node.children[1]):
+                problems.append('altera a lista {}'.format(lista))
+        stack.extend(c for c in node.children if isinstance(c, Node))
+    return sorted(set(problems))
+
+
+def tail_calls(stmts, name, params):
+    # Troca 'return f(...)' da própria função por uma nova atribuição dos
+    # parâmetros e 'continue'; o corpo fica dentro de um 'while True'.
+    # Só entra nos ramos dos 'se': dentro de um laço o continue seria do
+    # laço interno. Retorna os comandos e se achou alguma chamada.
+    result = []
+    found = False
+    for stmt in stmts:
+        if isinstance(stmt, ast.If):
+            stmt.body, corpo = tail_calls(stmt.body, name, params)
+            stmt.orelse, senao = tail_calls(stmt.orelse, name, params)
+            found = found or corpo or senao
+        elif (isinstance(stmt, ast.Return) and isinstance(stmt.value, ast.Call)
+              and isinstance(stmt.value.func, ast.Name) and stmt.value.func.id == name
+              and len(stmt.value.args) == len(params)):
+            # Todos os argumentos são calculados antes de qualquer parâmetro
+            # mudar, como numa chamada
+            args = stmt.value.args
+            if len(params) == 1:
+                result.append(ast.Assign([ast.Name(params[0], ast.Store())], args[0]))
+            elif params:
+                alvos = ast.Tuple([ast.Name(param, ast.Store()) for param in params], ast.Store())
+                result.append(ast.Assign([alvos], ast.Tuple(args, ast.Load())))
+            result.append(ast.Continue())
+            found = True
+            continue
+        result.append(stmt)
+    return result, found
+
+
+def param_names(funcao):
+    # Nomes dos parâmetros de uma função 'define', em ordem
+    if len(funcao.children) < 2:
+        return []
+    names = []
+    node = funcao.children[0]
+    while node.type == 'lista_params':
+        names.append(node.children[1].children[0])
+        node = node.children[0]
+    names.append(node.children[0])
+    return names[::-1]
+
+
+def inline_expression(expr, params):
+    # Se a expressão pode ser copiada para o lugar da chamada: só lê os
+    # parâmetros (e não outras variáveis, que o lugar da chamada poderia ver
+    # com outro valor) e só chama funções pré-definidas que não alteram
+    # listas
+    tamanho = 0
+    stack = [expr]
+    while stack:
+        node = stack.pop()
+        tamanho += 1
+        if node.type not in INLINE_TYPES or tamanho > INLINE_MAX_NODES:
+            return False
+        elif node.type == 'id' and node.leaf not in params:
+            return False
+        elif node.type == 'vetor' and node.children[0] not in params:
+            return False
+        elif node.type == 'func_com' and (not is_builtin(node.leaf) or node.leaf in MUTATING_BUILTINS):
+            return False
+        stack.extend(c for c in node.children if isinstance(c, Node))
+    return True
+
+
+def inline_candidates(tree):
+    # Funções 'define' não memorizadas cujo corpo é só 'retorna <expressão>'
+    # com uma expressão aceita pelo inline_expression(). Um nome definido
+    # mais de uma vez fica de fora, já que a chamada pode ver qualquer uma
+    # das definições.
+    definicoes = {}
+    stack = [tree]
+    while stack:
+        node = stack.pop()
+        if node.type == 'funcao':
+            definicoes[node.leaf] = definicoes.get(node.leaf, 0) + 1
+        stack.extend(c for c in node.children if isinstance(c, Node))
+
+    candidates = {}
+    for name, funcao in functions.items():
+        if definicoes.get(name) != 1 or funcao.datatype == 'memorizado':
+            continue
+        corpo = funcao.children[-1].children[0].children
+        params = param_names(funcao)
+        if params and len(corpo) == 1 and corpo[0].type == 'retorna' and \
+                inline_expression(corpo[0].children[0], params):
+            candidates[name] = (params, corpo[0].children[0])
+    return candidates
+
+
+def pure(node):
+    # Se a expressão não tem efeitos: sem chamadas a funções 'define' nem
+    # 'leia'
+    return not uses(node, lambda n: n.type == 'func' or (n.type == 'func_com' and not is_builtin(n.leaf)))
+
+
+def substitute(node, mapping):
+    # Cópia da expressão com os parâmetros trocados pelos nós de mapping
+    if node.type == 'id':
+        return mapping[node.leaf]
+    children = []
+    for child in node.children:
+        if isinstance(child, Node):
+            children.append(substitute(child, mapping))
+        elif node.type == 'vetor':
+            children.append(mapping[child].leaf)
+        else:
+            children.append(child)
+    return Node(node.type, children=children, leaf=node.leaf, datatype=node.datatype, lineno=node.lineno)
+
+
+def uses(node, test):
+    # Se algum nó da subárvore satisfaz test
+    stack = [node]
+    while stack:
+        node = stack.pop()
+        if test(node):
+            return True
+        stack.extend(c for c in node.children if isinstance(c, Node))
+    return False
+
+
+def invariant(node, assigned):
+    # Se a expressão dá sempre o mesmo valor enquanto nenhum nome em
+    # 'assigned' muda. Chamadas e leituras de listas não são aceitas.
+    if node.type in LITERALS:
+        return True
+    elif node.type == 'id':
+        return node.leaf not in assigned
+    elif node.type in ('bin_op', 'paren'):
+        return all(invariant(c, assigned) for c in node.children)
+    return False
+
+
+_temp_names = 0
+
+
+def temp_name(prefix):
+    # Nome para variáveis auxiliares do código gerado; o '_' garante que
+    # não colide com nomes da linguagem
+    global _temp_names
+    _temp_names += 1
+    return '_{}{}'.format(prefix, _temp_names)
+
+
+def make_arguments(args):
+    arguments = ast.arguments(args=args, vararg=None, kwonlyargs=[], kw_defaults=[], kwarg=None, defaults=[])
+    # Campo novo a partir do Python 3.8
+    arguments.posonlyargs = []
+    return arguments
+
 class Node:
-    def __init__(self, type, children=None, leaf=None, datatype=None):
-        self.type = type
+    # Árvores grandes têm centenas de milhares de nós, então cada nó guarda
+    # só os cinco campos (sem __dict__), os filhos ficam numa tupla e as
+    # folhas compartilham a mesma tupla vazia. O tipo é uma string interna,
+    # que ocupa o mesmo que uma referência para um inteiro.
+    __slots__ = ('type', 'children', 'leaf', 'datatype', 'lineno')
+
+    def __init__(self, type, children=None, leaf=None, datatype=None, lineno=None):
+        self.type = sys.intern(type)
         if children:
             if not isinstance(children, (list, tuple)):
-                children = [children]
-            self.children = children
+                children = (children,)
+            self.children = tuple(children)
         else:
-            self.children = []
+            self.children = ()
         self.leaf = leaf
         self.datatype = datatype
+        # Linha no código fonte, só nos nós que precisam dela
+        self.lineno = lineno
 
 
     def _pretty(self, prefix='| '):
@@ -47,298 +548,821 @@ class Node:
 
 
     def visit(self):
-        if self.type == 'funcao':
-            #start new scope
-            scope.append(None)
-            self.children[0].visit()
-            if len(self.children) > 1:
-                self.children[1].visit()
-            while scope.pop(): pass
-
-        elif self.type == 'corpo' or self.type == 'para' or self.type == 'enquanto':
-            scope.append(None)
-            for child in self.children:
-                if isinstance(child, Node):
-                    child.visit()
-            while scope.pop(): pass
-        elif self.type == 'definicao_loop':
-            # caso "para A em B faça"
-            # Verifica se B está no escopo
-            for var in scope[::-1]:
-                if var and var[0] == self.children[1]:
-                    break
+        checker.visit(self)
+
+
+    def collect_functions(self):
+        # Registra as funções 'define' antes da checagem, já que elas podem
+        # ser chamadas antes de serem declaradas. As aninhadas só existem
+        # dentro da função em que estão (local_functions).
+        stack = [self]
+        while stack:
+            node = stack.pop()
+            if node.type == 'funcao':
+                functions[node.leaf] = node
             else:
-                print("{} não foi definido".format(self.children[1]))
+                stack.extend(c for c in node.children if isinstance(c, Node))
 
-            # Adiciona A no escopo (falta o tipo)
-            scope.append((self.children[0], None))
 
-        elif self.type == 'var':
-            scope.append((self.children[0], self.leaf))
+    def optimize(self, level=1):
+        # Passo entre o visit() e o to_python_ast(). Nível 1 calcula as
+        # expressões constantes e remove os ramos que nunca executam; nível 2
+        # também troca operações caras por equivalentes mais baratas.
+        # Comandos podem virar uma lista (vazia ou com o corpo de um 'se').
+        if self.type == 'comando':
+            body = []
+            for child in self.children:
+                stmt = child.optimize(level)
+                if isinstance(stmt, list):
+                    body.extend(stmt)
+                else:
+                    body.append(stmt)
+            self.children = body
+            return self
 
-        elif self.type == 'declaracao':
-            global t
-            t = self.leaf
-            self.children[0].visit()
+        if self.type == 'funcao':
+            local_functions.append(nested_functions(self))
+            self.children = tuple(c.optimize(level) if isinstance(c, Node) else c for c in self.children)
+            local_functions.pop()
+            return self
+
+        self.children = tuple(c.optimize(level) if isinstance(c, Node) else c for c in self.children)
+
+        if self.type == 'paren':
+            if self.children[0].type in LITERALS:
+                return self.children[0]
+
+        elif self.type in ('bin_op', 'comp_op', 'log_op'):
+            if all(c.type in LITERALS for c in self.children):
+                operandos = [literal_value(c) for c in self.children]
+                if len(operandos) == 2 and fold_too_big(self.leaf, *operandos):
+                    return self
+                try:
+                    value = FOLD[self.leaf](*operandos)
+                except (ArithmeticError, TypeError, ValueError, MemoryError):
+                    return self
+                folded = literal_node(value)
+                if folded is not None:
+                    return folded
+            elif level >= 2 and self.leaf == 'na':
+                base, expoente = self.children
+                # x na 2 -> x vezes x
+                if base.type == 'id' and expoente.type == 'valor_int' and expoente.leaf == 2:
+                    return Node('bin_op', children=[base, base], leaf='vezes', datatype=self.datatype)
 
-        elif self.type == 'atribuicao':
-            if (len(self.children) > 1):
-                self.children[1].visit()
-                if self.children[1].datatype and t != self.children[1].datatype:
-                    print("Atribuição com conflito de tipos: {} - {}".format(t, self.children[1].datatype))
+        elif self.type == 'condicao':
+            stmts = self.prune()
+            if stmts is not None:
+                return stmts
+
+        elif self.type == 'senão se':
+            # O 'se' de dentro já foi resolvido e virou uma lista de comandos
+            if isinstance(self.children[0], list):
+                return Node('senão', children=[Node('comando', children=self.children[0]), 'e_deu'])
 
-            scope.append((self.children[0], t))
+        elif self.type == 'func_com':
+            if level >= 2 and self.leaf in inlinable and not is_builtin(self.leaf):
+                inlined = self.inline()
+                if inlined is not None:
+                    return inlined.optimize(level)
+
+        elif self.type == 'enquanto':
+            teste = constant_test(self.children[0])
+            if teste is not None and not literal_value(teste):
+                return []
+            counted = self.counted_loop()
+            if counted is not None:
+                return counted
 
-        elif self.type == 'acao_atribuicao':
-            for var in scope[::-1]:
-                if var and var[0] == self.children[0]:
-                    if self.children[1].datatype and var[1] != self.children[1].datatype:
-                        print("Atribuição com conflito de tipos: {} - {}".format(var[1], self.children[1].datatype))
-                    break
+        return self
+
+
+    def counted_loop(self):
+        # enquanto i é menor que N faça ... incrementa i. e deu
+        # vira um 'contagem', gerado como for com range(), quando i só muda
+        # no incremento do fim e N não muda dentro do laço
+        if self.datatype != 'int':
+            return None
+        comp = self.children[0].children[0]
+        if comp.leaf not in ('é_menor_que', 'é_menor_ou_igual_a'):
+            return None
+        counter, bound = comp.children
+        body = self.children[1].children[0].children
+        if not body:
+            return None
+        last = body[-1]
+        if last.type != 'unary_op' or last.leaf != 'incrementa' or last.children[0].type != 'id':
+            return None
+        if last.children[0].leaf != counter.leaf:
+            return None
+
+        corpo = Node('comando')
+        corpo.children = list(body[:-1])
+        assigned = assigned_names(corpo)
+        if counter.leaf in assigned or counter.leaf == bound.leaf:
+            return None
+        if not invariant(bound, assigned | {counter.leaf}):
+            return None
+        return Node('contagem', children=[counter.leaf, bound, corpo], leaf=comp.leaf, lineno=self.lineno)
+
+
+    def inline(self):
+        # soma com a, b  ->  a mais b, para 'define soma com int x, int y como
+        # retorna x mais y.' Argumentos que não podem ser copiados direto
+        # viram variáveis auxiliares, calculadas na ordem da chamada antes
+        # da expressão (o nó 'inline'). Se algum argumento tem efeitos, todos
+        # os que não são literais viram variáveis auxiliares, para que os
+        # outros sejam lidos no mesmo momento que seriam na chamada.
+        params, expr = inlinable[self.leaf]
+        args = args_list(self.children[0])
+        if len(args) != len(params):
+            return None
+        usos = {param: 0 for param in params}
+        listas = set()
+        stack = [expr]
+        while stack:
+            node = stack.pop()
+            if node.type == 'id':
+                usos[node.leaf] += 1
+            elif node.type == 'vetor':
+                listas.add(node.children[0])
+            stack.extend(c for c in node.children if isinstance(c, Node))
+
+        todos = not all(pure(arg) for arg in args)
+        mapping = {}
+        temps = []
+        valores = []
+        for param, arg in zip(params, args):
+            if arg.type in LITERALS and param not in listas:
+                mapping[param] = arg
+            elif arg.type == 'id' and not todos:
+                mapping[param] = arg
+            elif not todos and usos[param] == 1 and param not in listas:
+                mapping[param] = arg
             else:
-                print("{} não foi definido".format(self.children[0]))
-            self.children[1].visit()
+                temp = temp_name('arg')
+                temps.append(temp)
+                valores.append(arg)
+                mapping[param] = Node('id', leaf=temp, datatype=arg.datatype)
+        corpo = substitute(expr, mapping)
+        if not temps:
+            return corpo
+        return Node('inline', children=valores + [corpo], leaf=tuple(temps), datatype=corpo.datatype)
+
+
+    def prune(self):
+        # Comandos que sobram de um 'se' com teste constante, ou None se o
+        # teste só é conhecido na execução
+        teste = constant_test(self.children[0])
+        if teste is None:
+            return None
+        if literal_value(teste):
+            return list(self.children[1].children[0].children)
+
+        senao = self.children[2]
+        if senao == 'e_deu':
+            return []
+        elif senao.type == 'senão se':
+            return [senao.children[0]]
+        else:
+            return list(senao.children[0].children)
 
-        elif self.type == 'id':
-            for var in scope[::-1]:
-                if var and var[0] == self.leaf:
-                    break
+
+    def to_python_ast(self):
+        return generator.visit(self)
+
+
+class _Table(dict):
+    # Método de cada tipo de nó, procurado na classe só na primeira vez que
+    # o tipo aparece
+    def __init__(self, cls):
+        super().__init__()
+        self.cls = cls
+
+    def __missing__(self, kind):
+        method = getattr(self.cls, 'visit_' + kind.replace(' ', '_'), self.cls.generic)
+        self[kind] = method
+        return method
+
+
+class Visitor:
+    # Passo sobre a árvore com despacho por tabela: o nó do tipo 'bin_op' vai
+    # para visit_bin_op() e o do tipo 'senão se' para visit_senão_se(). Tipos
+    # sem método vão para generic(). Um passo novo (otimização, perfil,
+    # impressão) é uma subclasse, sem mexer no Node.
+    table = None
+
+    def __init_subclass__(cls, **kwargs):
+        super().__init_subclass__(**kwargs)
+        cls.table = _Table(cls)
+
+    def visit(self, node):
+        return self.table[node.type](self, node)
+
+    def generic(self, node):
+        for child in node.children:
+            if isinstance(child, Node):
+                self.visit(child)
+
+
+class Checker(Visitor):
+    # Checagem de nomes e tipos. As mensagens vão para a saída padrão; o
+    # resultado fica no datatype dos nós, que o optimize() e a geração de
+    # código consultam.
+
+    def visit_funcao(self, node):
+        #start new scope
+        scope.push()
+        local_functions.append(nested_functions(node))
+        self.visit(node.children[0])
+        if len(node.children) > 1:
+            self.visit(node.children[1])
+        scope.pop()
+        # Em 'funcao', datatype marca as funções 'define memorizado'
+        if node.datatype == 'memorizado':
+            for problem in memo_problems(node):
+                print("Função {} não pode ser memorizada: {}".format(node.leaf, problem))
+                node.datatype = None
+        local_functions.pop()
+
+    def scoped(self, node):
+        scope.push()
+        self.generic(node)
+        scope.pop()
+
+    visit_corpo = scoped
+    visit_para = scoped
+
+    def visit_enquanto(self, node):
+        self.scoped(node)
+        # Em 'enquanto', datatype marca um teste entre dois int, candidato a
+        # virar um laço com range() no optimize()
+        comp = node.children[0].children[0]
+        if comp.type == 'comp_op' and comp.children[0].type == 'id':
+            if expr_type(comp.children[0]) == 'int' and expr_type(comp.children[1]) == 'int':
+                node.datatype = 'int'
+
+    def visit_para_paralelo(self, node):
+        self.scoped(node)
+        # Em 'para_paralelo', datatype marca um corpo que pode rodar em outros
+        # processos: cada processo tem a sua cópia das variáveis, então
+        # alterações de fora do laço se perderiam
+        corpo = node.children[1]
+        node.datatype = 'paralelo'
+        for name in shared_writes(corpo, node.children[0].children[0]):
+            print("Laço paralelo na linha {} altera {}, declarada fora do laço; ele vai rodar em sequência".format(node.lineno, name))
+            node.datatype = None
+        if uses(corpo, lambda n: n.type == 'func' and n.children[0] == 'leia'):
+            print("Laço paralelo na linha {} usa leia; ele vai rodar em sequência".format(node.lineno))
+            node.datatype = None
+        if uses(corpo, lambda n: n.type == 'retorna'):
+            print("Laço paralelo na linha {} usa retorna; ele vai rodar em sequência".format(node.lineno))
+            node.datatype = None
+
+    def visit_definicao_loop(self, node):
+        # caso "para A em B faça"
+        # Verifica se B está no escopo
+        if node.children[1] not in scope:
+            print("{} não foi definido".format(node.children[1]))
+
+        # Adiciona A no escopo. Só as listas tipadas dão o tipo de A.
+        scope.declare(node.children[0], ELEMENT_TYPES.get(scope.lookup(node.children[1])))
+
+    def visit_var(self, node):
+        scope.declare(node.children[0], node.leaf)
+
+    def visit_declaracao(self, node):
+        global t
+        t = node.leaf
+        self.visit(node.children[0])
+
+    def visit_atribuicao(self, node):
+        if (len(node.children) > 1):
+            self.visit(node.children[1])
+            if node.children[1].datatype and t != node.children[1].datatype:
+                print("Atribuição com conflito de tipos: {} - {}".format(t, node.children[1].datatype))
+            if t in ELEMENT_TYPES and node.children[1].type == 'id':
+                val_type = scope.lookup(node.children[1].leaf, '')
+                if val_type in ELEMENT_TYPES and val_type != t:
+                    print("Atribuição com conflito de tipos: {} - {}".format(t, val_type))
+
+        node.datatype = t
+        scope.declare(node.children[0], t)
+
+    def visit_acao_atribuicao(self, node):
+        if len(node.children) > 2:
+            # l[i] é valor
+            for child in node.children[1:]:
+                self.visit(child)
+            if node.children[0] in scope:
+                element_type = ELEMENT_TYPES.get(scope.lookup(node.children[0]))
+                val_type = expr_type(node.children[2])
+                if element_type and not accepts(element_type, val_type):
+                    print("Atribuição com conflito de tipos: {} - {}".format(element_type, val_type))
             else:
-                print("{} não foi definido".format(self.leaf))
+                print("{} não foi definido".format(node.children[0]))
+            return
 
-        elif self.type == 'bin_op' or self.type == 'comp_op':
-            for child in self.children:
-                val_type = ''
-                if isinstance(child, Node):
-                    child.visit()
-                if child.type == 'id':
-                    for var in scope[::-1]:
-                        if var and var[0] == child.leaf:
-                            val_type = var[1]
-                            break
-                else:
-                    val_type = child.datatype
-
-                if val_type == 'int':
-                    if self.type == 'comp_op':
-                        self.datatype = 'bool'
-                    elif self.datatype != 'real':
-                        self.datatype = 'int'
-                    # Todas as operações de dividir retornam "real"
-                    if self.leaf == 'dividido_por':
-                        self.datatype = 'real'
-                elif val_type == 'real':
-                    if self.type == 'comp_op':
-                        self.datatype = 'bool'
-                    else:
-                        self.datatype = 'real'
-                elif val_type:
-                    print('A operação {} não suporta o tipo {}.'.format(self.leaf, val_type))
-
-        elif self.type == 'log_op':
-            for child in self.children:
-                val_type = ''
-                if isinstance(child, Node):
-                    child.visit()
-                if child.type == 'id':
-                    for var in scope[::-1]:
-                        if var and var[0] == child.leaf:
-                            val_type = var[1]
-                            break
-                else:
-                    val_type = child.datatype
+        if node.children[0] in scope:
+            var_type = scope.lookup(node.children[0])
+            if node.children[1].datatype and var_type != node.children[1].datatype:
+                print("Atribuição com conflito de tipos: {} - {}".format(var_type, node.children[1].datatype))
+        else:
+            print("{} não foi definido".format(node.children[0]))
+        self.visit(node.children[1])
 
-                if val_type == 'bool':
-                    self.datatype = 'bool'
-                elif val_type:
-                    print('A operação {} não suporta o tipo {}.'.format(self.leaf, val_type))
+    def visit_id(self, node):
+        if node.leaf not in scope:
+            print("{} não foi definido".format(node.leaf))
 
-        elif self.type == 'unary_op':
+    def visit_vetor(self, node):
+        self.visit(node.children[1])
+        if node.children[0] in scope:
+            node.datatype = ELEMENT_TYPES.get(scope.lookup(node.children[0]))
+        else:
+            print("{} não foi definido".format(node.children[0]))
+
+    def visit_indice(self, node):
+        self.visit(node.children[0])
+        val_type = expr_type(node.children[0])
+        if val_type and val_type != 'int':
+            print('Índice não aceita o tipo {}.'.format(val_type))
+
+    def visit_bin_op(self, node):
+        for child in node.children:
             val_type = ''
-            if self.children[0].type == 'id':
-                for var in scope[::-1]:
-                    if var and var[0] == self.children[0].leaf:
-                        val_type = var[1]
-                        break
+            if isinstance(child, Node):
+                self.visit(child)
+            if child.type == 'id':
+                val_type = scope.lookup(child.leaf, '')
             else:
                 val_type = child.datatype
 
             if val_type == 'int':
-                self.datatype = 'int'
+                if node.type == 'comp_op':
+                    node.datatype = 'bool'
+                elif node.datatype != 'real':
+                    node.datatype = 'int'
+                # Todas as operações de dividir retornam "real"
+                if node.leaf == 'dividido_por':
+                    node.datatype = 'real'
+            elif val_type == 'real':
+                if node.type == 'comp_op':
+                    node.datatype = 'bool'
+                else:
+                    node.datatype = 'real'
             elif val_type:
-                print('A operação {} não suporta o tipo {}.'.format(self.leaf, val_type))
+                print('A operação {} não suporta o tipo {}.'.format(node.leaf, val_type))
 
-        elif self.type == 'teste':
-            for child in self.children:
-                if isinstance(child, Node):
-                    child.visit()
-            if self.children[0].datatype and self.children[0].datatype != 'bool':
-                print('Condição não aceita o tipo {}.'.format(self.children[0].datatype))
+    visit_comp_op = visit_bin_op
 
-        else:
-            for child in self.children:
-                if isinstance(child, Node):
-                    child.visit()
-
-
-    def to_python_ast(self):
-        op = {
-                'mais': ast.Add,
-                'menos': ast.Sub,
-                'vezes': ast.Mult,
-                'dividido_por': ast.Div,
-                'na': ast.Pow,
-                'e': ast.And,
-                'ou': ast.Or,
-                'não': ast.Not,
-                'verdadeiro': True,
-                'falso': False,
-                'é_igual_a': ast.Eq,
-                'é_diferente_de': ast.NotEq,
-                'é_menor_que': ast.Lt,
-                'é_menor_ou_igual_a': ast.LtE,
-                'é_maior_que': ast.Gt,
-                'é_maior_ou_igual_a': ast.GtE,
-                'incrementa': ast.Add,
-                'decrementa': ast.Sub
-        }
+    def visit_log_op(self, node):
+        for child in node.children:
+            val_type = ''
+            if isinstance(child, Node):
+                self.visit(child)
+            if child.type == 'id':
+                val_type = scope.lookup(child.leaf, '')
+            else:
+                val_type = child.datatype
 
+            if val_type == 'bool':
+                node.datatype = 'bool'
+            elif val_type:
+                print('A operação {} não suporta o tipo {}.'.format(node.leaf, val_type))
 
-        if self.type == 'comando':
-            c1 = self.children[0].to_python_ast()
-            if len(self.children) > 1:
-                c2 = self.children[1].to_python_ast()
-                if isinstance(c2, list):
-                    c1.extend(c2)
-                else:
-                    c1.append(c2)
-                return c1
+    def visit_unary_op(self, node):
+        val_type = ''
+        if node.children[0].type == 'id':
+            val_type = scope.lookup(node.children[0].leaf, '')
+        else:
+            val_type = node.children[0].datatype
+
+        if val_type == 'int':
+            node.datatype = 'int'
+        elif val_type:
+            print('A operação {} não suporta o tipo {}.'.format(node.leaf, val_type))
+
+    def visit_range(self, node):
+        for child in node.children:
+            self.visit(child)
+            if child.type == 'id':
+                val_type = scope.lookup(child.leaf, '')
             else:
-                if isinstance(c1, list):
-                    return c1
-                else:
-                    return [c1]
-        elif self.type == 'bin_op':
-            return ast.BinOp(self.children[0].to_python_ast(), op[self.leaf](), self.children[1].to_python_ast())
-        elif self.type == 'log_op':
-            if self.leaf == 'não':
-                return ast.UnaryOp(op[self.leaf](), self.children[0].to_python_ast())
+                val_type = child.datatype
+            if val_type and val_type != 'int':
+                print('Intervalo não aceita o tipo {}.'.format(val_type))
+
+    def visit_func_com(self, node):
+        self.visit(node.children[0])
+        if is_builtin(node.leaf):
+            arg_types = [expr_type(arg) for arg in args_list(node.children[0])]
+            node.datatype = check_builtin(node.leaf, arg_types)
+
+    def visit_teste(self, node):
+        self.generic(node)
+        if node.children[0].datatype and node.children[0].datatype != 'bool':
+            print('Condição não aceita o tipo {}.'.format(node.children[0].datatype))
+
+
+# Operadores da linguagem nos operadores do Python
+OPERATORS = {
+    'mais': ast.Add,
+    'menos': ast.Sub,
+    'vezes': ast.Mult,
+    'dividido_por': ast.Div,
+    'na': ast.Pow,
+    'e': ast.And,
+    'ou': ast.Or,
+    'não': ast.Not,
+    'é_igual_a': ast.Eq,
+    'é_diferente_de': ast.NotEq,
+    'é_menor_que': ast.Lt,
+    'é_menor_ou_igual_a': ast.LtE,
+    'é_maior_que': ast.Gt,
+    'é_maior_ou_igual_a': ast.GtE,
+    'incrementa': ast.Add,
+    'decrementa': ast.Sub,
+}
+
+BOOLEANS = {
+    'verdadeiro': True,
+    'falso': False,
+}
+
+
+class CodeGenerator(Visitor):
+    # Gera a árvore do Python. Comandos viram um nó ou uma lista de nós;
+    # expressões viram um nó.
+
+    # Gerando o 'enquanto' reserva de um 'contagem'
+    plain_loops = False
+
+    def generic(self, node):
+        return None
+
+    def visit_comando(self, node):
+        body = []
+        for child in node.children:
+            stmt = self.visit(child)
+            if isinstance(stmt, list):
+                body.extend(stmt)
+            elif isinstance(stmt, ast.expr):
+                # Expressão usada como comando
+                body.append(ast.Expr(stmt))
             else:
-                return ast.BoolOp(op[self.leaf](), [self.children[0].to_python_ast(), self.children[1].to_python_ast()])
-        elif self.type == 'comp_op':
-            return ast.Compare(self.children[0].to_python_ast(), [op[self.leaf]()], [self.children[1].to_python_ast()])
-        elif self.type == 'paren':
-            return self.children[0].to_python_ast()
-        elif self.type == 'valor_int' or self.type == 'valor_real':
-            return ast.Num(self.leaf)
-        elif self.type == 'valor_texto':
-            return ast.Str(self.leaf)
-        elif self.type == 'valor_bool':
-            return ast.NameConstant(op[self.leaf])
-        elif self.type == 'id':
-            return ast.Name(self.leaf, ast.Load())
-        elif self.type == 'acao_atribuicao':
-            if len(self.children) > 2:
-                target = ast.Name(self.children[0], ast.Load())
-                ind = self.children[1].to_python_ast()
-                value = self.children[2].to_python_ast()
-                target = ast.Subscript(target, ind, ast.Store())
+                body.append(stmt)
+        if not body:
+            # Bloco que ficou vazio depois das otimizações
+            body.append(ast.Pass())
+        return body
+
+    def visit_bin_op(self, node):
+        return ast.BinOp(self.visit(node.children[0]), OPERATORS[node.leaf](), self.visit(node.children[1]))
+
+    def visit_log_op(self, node):
+        if node.leaf == 'não':
+            return ast.UnaryOp(OPERATORS[node.leaf](), self.visit(node.children[0]))
+        return ast.BoolOp(OPERATORS[node.leaf](), [self.visit(node.children[0]), self.visit(node.children[1])])
+
+    def visit_comp_op(self, node):
+        return ast.Compare(self.visit(node.children[0]), [OPERATORS[node.leaf]()], [self.visit(node.children[1])])
+
+    def visit_inline(self, node):
+        # (_arg1 := a, _arg2 := b, <expressão>)[-1]
+        itens = [ast.NamedExpr(ast.Name(temp, ast.Store()), self.visit(valor))
+                 for temp, valor in zip(node.leaf, node.children)]
+        itens.append(self.visit(node.children[-1]))
+        return ast.Subscript(ast.Tuple(itens, ast.Load()), ast.Index(ast.Num(-1)), ast.Load())
+
+    def visit_valor_int(self, node):
+        return ast.Num(node.leaf)
+
+    visit_valor_real = visit_valor_int
+
+    def visit_valor_texto(self, node):
+        return ast.Str(node.leaf)
+
+    def visit_valor_bool(self, node):
+        return ast.NameConstant(BOOLEANS[node.leaf])
+
+    def visit_id(self, node):
+        return ast.Name(node.leaf, ast.Load())
+
+    def visit_acao_atribuicao(self, node):
+        if len(node.children) > 2:
+            target = ast.Name(node.children[0], ast.Load())
+            ind = self.visit(node.children[1])
+            value = self.visit(node.children[2])
+            target = ast.Subscript(target, ind, ast.Store())
+        else:
+            target = ast.Name(node.children[0], ast.Store())
+            value = self.visit(node.children[1])
+        return ast.Assign([target], value)
+
+    def visit_indice(self, node):
+        return ast.Index(self.visit(node.children[0]))
+
+    def visit_vetor(self, node):
+        target = ast.Name(node.children[0], ast.Load())
+        ind = self.visit(node.children[1])
+        return ast.Subscript(target, ind, ast.Load())
+
+    def visit_atribuicao(self, node):
+        target = ast.Name(node.children[0], ast.Store())
+        if node.datatype in ELEMENT_TYPES:
+            typecode = ast.Str(TYPECODES[ELEMENT_TYPES[node.datatype]])
+            if len(node.children) == 1:
+                value = runtime_call('TypedList', [typecode])
+            elif node.children[1].type == 'range':
+                args = [typecode] + [self.visit(c) for c in node.children[1].children]
+                value = located(runtime_call('typed_range', args), node.children[1].lineno)
             else:
-                target = ast.Name(self.children[0], ast.Store())
-                value = self.children[1].to_python_ast()
+                value = runtime_call('TypedList', [typecode, self.visit(node.children[1])])
             return ast.Assign([target], value)
-        elif self.type == 'indice':
-            return ast.Index(self.children[0].to_python_ast())
-        elif self.type == 'vetor':
-            target = ast.Name(self.children[0], ast.Load())
-            ind = self.children[1].to_python_ast()
-            return ast.Subscript(target, ind, ast.Load())
-        elif self.type == 'declaracao':
-            return self.children[0].to_python_ast()
-        elif self.type == 'atribuicao':
-            target = ast.Name(self.children[0], ast.Store())
-            if len(self.children) > 1:
-                if self.children[1].type == 'range':
-                    value = ast.List(self.children[1].to_python_ast(), ast.Load())
-                else:
-                    value = self.children[1].to_python_ast()
-                return ast.Assign([target], value)
-            else:
-                return target
-        elif self.type == 'range':
-            val1 = self.children[0].to_python_ast()
-            val2 = self.children[1].to_python_ast()
-            if isinstance(val1, ast.Num) and isinstance(val2, ast.Num):
-                el = []
-                for v in range(val1.n, val2.n):
-                    el.append(ast.Num(v))
-                return el
-            return None
-        elif self.type == 'func':
-            args_nodes = self.children[1].to_python_ast()
-            if not isinstance(args_nodes, list):
-                args_nodes = [args_nodes]
-
-            if self.children[0] == 'mostra':
-                func_node = ast.Name(id='print', ctx=ast.Load())
-            elif self.children[0] == 'leia':
-                func_node = ast.Name(id='input', ctx=ast.Load())
-
-            return ast.Expr(ast.Call(func_node, args_nodes, []))
-        elif self.type == 'lista_args' or self.type == 'lista_atribuicoes' or self.type == 'lista_params':
-            n1 = self.children[0].to_python_ast()
-            n2 = self.children[1].to_python_ast()
-            if isinstance(n1, list):
-                n1.append(n2)
-                return n1
-            else:
-                return [n1, n2]
-        elif self.type == 'condicao':
-            teste = self.children[0].to_python_ast()
-            corpo = self.children[1].to_python_ast()
-            if self.children[2] == 'e_deu':
-                senaose = []
+        elif len(node.children) > 1:
+            value = self.visit(node.children[1])
+            return ast.Assign([target], value)
+        else:
+            # Declaração sem valor recebe o valor padrão do tipo
+            if node.datatype == 'texto':
+                value = ast.Str('')
+            elif node.datatype == 'lista':
+                value = ast.List([], ast.Load())
+            elif node.datatype == 'real':
+                value = ast.Num(0.0)
             else:
-                senaose = self.children[2].to_python_ast()
+                value = ast.Num(0)
+            return ast.Assign([target], value)
 
-            return ast.If(teste, corpo, senaose)
-        elif self.type == 'teste' or self.type == 'corpo' or self.type == 'senão' or self.type == 'corpo_loop':
-            return self.children[0].to_python_ast()
-        elif self.type == 'senão se':
-            return [self.children[0].to_python_ast()]
-        elif self.type == 'enquanto':
-            return ast.While(self.children[0].to_python_ast(), self.children[1].to_python_ast(), [])
-        elif self.type == 'var':
-            return ast.arg(self.children[0], None)
-        elif self.type == 'inside_funcion':
-            return self.children[0].to_python_ast()
-        elif self.type == 'funcao':
-            if len(self.children) > 1:
-                params = ast.arguments(self.children[0].to_python_ast(), None, [], [], None, [])
-                corpo = self.children[1].to_python_ast()
-            else:
-                params = ast.arguments([], None, [], [], None, [])
-                corpo = self.children[0].to_python_ast()
-            return ast.FunctionDef(self.leaf, params, corpo, [], None)
-        elif self.type == 'retorna':
-            return ast.Return(self.children[0].to_python_ast())
-        elif self.type == 'func_com':
-            args = self.children[0].to_python_ast()
-            return ast.Expr(ast.Call(ast.Name(self.leaf, ast.Load()), args, []))
-        elif self.type == 'unary_op':
-            target = ast.Name(self.children[0].leaf, ast.Store())
-            return ast.AugAssign(target, op[self.leaf](), ast.Num(1))
-        elif self.type == 'para':
-            definicao = self.children[0].to_python_ast()
-            corpo_loop = self.children[1].to_python_ast()
-            return ast.For(definicao[0], definicao[1], corpo_loop, [])
-        elif self.type == 'definicao_loop':
-            return [
-                ast.Name(self.children[0], ast.Store()),
-                ast.Name(self.children[1], ast.Load()),
-            ]
+    def visit_range(self, node):
+        # Os limites são avaliados em tempo de execução, então o código
+        # gerado não cresce com o tamanho da lista
+        args = [self.visit(node.children[0]), self.visit(node.children[1])]
+        # A linha aparece no traceback de um MemoryError
+        if options['lazy_ranges']:
+            return located(runtime_call('LazyRange', args), node.lineno)
+        return located(runtime_call('range_list', args), node.lineno)
+
+    def visit_func(self, node):
+        args_nodes = self.visit(node.children[1])
+        if not isinstance(args_nodes, list):
+            args_nodes = [args_nodes]
+
+        # A saída passa pelo buffer do runtime; 'leia' esvazia o buffer
+        # antes de perguntar
+        if node.children[0] == 'mostra':
+            return runtime_call('show', args_nodes)
+        elif node.children[0] == 'leia':
+            return runtime_call('read', args_nodes)
+
+    def visit_lista_args(self, node):
+        n1 = self.visit(node.children[0])
+        n2 = self.visit(node.children[1])
+        if isinstance(n1, list):
+            n1.append(n2)
+            return n1
+        else:
+            return [n1, n2]
 
+    visit_lista_atribuicoes = visit_lista_args
+    visit_lista_params = visit_lista_args
 
+    def visit_condicao(self, node):
+        teste = self.visit(node.children[0])
+        corpo = self.visit(node.children[1])
+        if node.children[2] == 'e_deu':
+            senaose = []
+        else:
+            senaose = self.visit(node.children[2])
+
+        return ast.If(teste, corpo, senaose)
+
+    def first_child(self, node):
+        return self.visit(node.children[0])
+
+    visit_teste = first_child
+    visit_corpo = first_child
+    visit_senão = first_child
+    visit_corpo_loop = first_child
+    visit_declaracao = first_child
+    visit_paren = first_child
+    visit_inside_funcion = first_child
+
+    def visit_senão_se(self, node):
+        return [self.visit(node.children[0])]
+
+    def visit_enquanto(self, node):
+        corpo_loop = self.visit(node.children[1])
+        if options['profile']:
+            corpo_loop.insert(0, loop_counter('enquanto', node.lineno))
+        if options['budget']:
+            corpo_loop.insert(0, budget_step(node.lineno))
+        return located(ast.While(self.visit(node.children[0]), corpo_loop, []), node.lineno)
+
+    def visit_contagem(self, node):
+        # _fim = N (mais 1)
+        # if type(i) is int and type(_fim) is int:
+        #     for i in range(i, _fim): ...
+        #     if i < _fim: i = _fim
+        # else:
+        #     while i < N: ... i += 1
+        # O if depois do for deixa i com o mesmo valor que o 'enquanto'
+        # deixaria. O tipo int declarado não é garantido na execução (um
+        # parâmetro pode receber 2,5), então com reais o laço continua sendo
+        # o 'enquanto' original.
+        if self.plain_loops:
+            return self.counting_while(node)
+        counter = node.children[0]
+        fim = temp_name('fim')
+        bound = self.visit(node.children[1])
+        if node.leaf == 'é_menor_ou_igual_a':
+            bound = ast.BinOp(bound, ast.Add(), ast.Num(1))
+        corpo_loop = self.visit(node.children[2])
+        if options['profile']:
+            corpo_loop.insert(0, loop_counter('enquanto', node.lineno))
+        intervalo = ast.Call(ast.Name('range', ast.Load()),
+                             [ast.Name(counter, ast.Load()), ast.Name(fim, ast.Load())], [])
+        ajuste = ast.If(ast.Compare(ast.Name(counter, ast.Load()), [ast.Lt()], [ast.Name(fim, ast.Load())]),
+                        [ast.Assign([ast.Name(counter, ast.Store())], ast.Name(fim, ast.Load()))], [])
+        laco = [
+            located(ast.For(ast.Name(counter, ast.Store()), intervalo, corpo_loop, []), node.lineno),
+            ajuste,
+        ]
+        if options['budget']:
+            # O número de voltas já é conhecido: os passos são cobrados de uma
+            # vez, antes do laço, em vez de um por volta
+            voltas = ast.BinOp(ast.Name(fim, ast.Load()), ast.Sub(), ast.Name(counter, ast.Load()))
+            laco.insert(0, located(ast.Expr(runtime_call('budget_steps', [voltas])), node.lineno))
+
+        # Laços dentro do 'enquanto' reserva também ficam como 'enquanto',
+        # senão o código dobraria a cada nível de aninhamento
+        self.plain_loops = True
+        try:
+            reserva = self.counting_while(node)
+        finally:
+            self.plain_loops = False
+        inteiros = [ast.Name(counter, ast.Load())]
+        if node.children[1].type != 'valor_int':
+            inteiros.append(ast.Name(fim, ast.Load()))
+        teste = ast.BoolOp(ast.And(), [ast.Compare(ast.Call(ast.Name('type', ast.Load()), [nome], []),
+                                                   [ast.Is()], [ast.Name('int', ast.Load())])
+                                       for nome in inteiros])
+        if len(teste.values) == 1:
+            teste = teste.values[0]
+        return [
+            ast.Assign([ast.Name(fim, ast.Store())], bound),
+            located(ast.If(teste, laco, [reserva]), node.lineno),
+        ]
+
+    def counting_while(self, node):
+        # O 'enquanto' de antes da troca pelo 'contagem'
+        counter = node.children[0]
+        comparacao = ast.Lt() if node.leaf == 'é_menor_que' else ast.LtE()
+        teste = ast.Compare(ast.Name(counter, ast.Load()), [comparacao], [self.visit(node.children[1])])
+        corpo_loop = self.visit(node.children[2])
+        corpo_loop.append(ast.AugAssign(ast.Name(counter, ast.Store()), ast.Add(), ast.Num(1)))
+        if options['profile']:
+            corpo_loop.insert(0, loop_counter('enquanto', node.lineno))
+        if options['budget']:
+            corpo_loop.insert(0, budget_step(node.lineno))
+        return located(ast.While(teste, corpo_loop, []), node.lineno)
+
+    def visit_var(self, node):
+        return ast.arg(node.children[0], None)
+
+    def visit_funcao(self, node):
+        local_functions.append(nested_functions(node))
+        if len(node.children) > 1:
+            params = self.visit(node.children[0])
+            if not isinstance(params, list):
+                params = [params]
+            params = make_arguments(params)
+            corpo = self.visit(node.children[1])
+        else:
+            params = make_arguments([])
+            corpo = self.visit(node.children[0])
+        local_functions.pop()
+        if options['budget']:
+            # Antes da eliminação da recursão em cauda, para contar também
+            # cada volta do laço que substitui a chamada
+            corpo.insert(0, budget_step(node.lineno))
+        decorators = []
+        if options['profile']:
+            decorators.append(runtime_call('profiled', [ast.Str(node.leaf), ast.Num(node.lineno or 0)]))
+        if options['optimize'] and node.datatype != 'memorizado' and \
+                not any(isinstance(n, ast.FunctionDef) for stmt in corpo for n in ast.walk(stmt)):
+            # Recursão em cauda vira laço: a pilha não cresce a cada
+            # chamada. Funções memorizadas continuam passando pelo cache
+            # e funções aninhadas continuam vendo os parâmetros da
+            # chamada em que foram criadas.
+            nomes = [param.arg for param in params.args]
+            laco, found = tail_calls(corpo, node.leaf, nomes)
+            if found:
+                if not isinstance(laco[-1], ast.Continue):
+                    laco.append(ast.Return(None))
+                corpo = [ast.While(ast.NameConstant(True), laco, [])]
+        if node.datatype == 'memorizado':
+            # Os argumentos do tipo lista viram tuplas para servir de chave
+            listas = [ast.Num(i) for i, param in enumerate(params.args) if param.arg in list_params(node)]
+            decorators.append(runtime_call('memoized', [ast.Str(node.leaf), ast.Num(node.lineno or 0),
+                                                        ast.Tuple(listas, ast.Load())]))
+        return located(ast.FunctionDef(node.leaf, params, corpo, decorators, None), node.lineno)
+
+    def visit_retorna(self, node):
+        return ast.Return(self.visit(node.children[0]))
+
+    def visit_func_com(self, node):
+        args = self.visit(node.children[0])
+        if not isinstance(args, list):
+            args = [args]
+        if is_builtin(node.leaf):
+            return runtime_call(BUILTINS[node.leaf][0], args)
+        return ast.Call(ast.Name(node.leaf, ast.Load()), args, [])
+
+    def visit_unary_op(self, node):
+        target = ast.Name(node.children[0].leaf, ast.Store())
+        return ast.AugAssign(target, OPERATORS[node.leaf](), ast.Num(1))
+
+    def visit_para(self, node):
+        definicao = self.visit(node.children[0])
+        corpo_loop = self.visit(node.children[1])
+        if options['profile']:
+            corpo_loop.insert(0, loop_counter('para', node.lineno))
+        if options['budget']:
+            corpo_loop.insert(0, budget_step(node.lineno))
+        return located(ast.For(definicao[0], definicao[1], corpo_loop, []), node.lineno)
+
+    def visit_para_paralelo(self, node):
+        # def _paraN(_itens):
+        #     _valores = []
+        #     for v in _itens:
+        #         <corpo>
+        #         _valores.append(v)
+        #     return _valores
+        # _tches.parallel_for(_paraN, l, True)
+        # O corpo vira uma função que o runtime chama com pedaços da
+        # lista, em outros processos. Se o corpo altera v, os valores
+        # finais de v voltam para a lista, na ordem original.
+        var, lista = node.children[0].children
+        escreve = var in assigned_names(node.children[1])
+        if node.datatype is None:
+            return self.sequential_para(node, escreve)
+        corpo_loop = self.visit(node.children[1])
+        if options['budget']:
+            # Cada processo conta os seus passos
+            corpo_loop.insert(0, budget_step(node.lineno))
+        corpo = []
+        if escreve:
+            valores = ast.Name('_valores', ast.Load())
+            corpo_loop.append(ast.Expr(ast.Call(ast.Attribute(valores, 'append', ast.Load()),
+                                                [ast.Name(var, ast.Load())], [])))
+            corpo.append(ast.Assign([ast.Name('_valores', ast.Store())], ast.List([], ast.Load())))
+        corpo.append(located(ast.For(ast.Name(var, ast.Store()), ast.Name('_itens', ast.Load()),
+                                     corpo_loop, []), node.lineno))
+        if escreve:
+            corpo.append(ast.Return(valores))
+        func = temp_name('para')
+        params = make_arguments([ast.arg('_itens', None)])
+        chamada = runtime_call('parallel_for', [ast.Name(func, ast.Load()), ast.Name(lista, ast.Load()),
+                                                ast.NameConstant(escreve)])
+        result = [located(ast.FunctionDef(func, params, corpo, [], None), node.lineno),
+                  ast.Expr(chamada)]
+        if options['profile']:
+            total = ast.Call(ast.Name('len', ast.Load()), [ast.Name(lista, ast.Load())], [])
+            result.insert(1, loop_counter('para', node.lineno, total))
+        return result
+
+    def sequential_para(self, node, escreve):
+        # _valoresN = []
+        # for v in l:
+        #     <corpo>
+        #     _valoresN.append(v)
+        # _tches.store_values(l, _valoresN)
+        # Laço 'em paralelo' que o checker mandou rodar em sequência: os
+        # valores finais de v voltam para a lista, como no caminho paralelo
+        loop = self.visit_para(node)
+        if not escreve:
+            return loop
+        var, lista = node.children[0].children
+        valores = temp_name('valores')
+        loop.body.append(ast.Expr(ast.Call(ast.Attribute(ast.Name(valores, ast.Load()), 'append', ast.Load()),
+                                           [ast.Name(var, ast.Load())], [])))
+        return [
+            ast.Assign([ast.Name(valores, ast.Store())], ast.List([], ast.Load())),
+            loop,
+            ast.Expr(runtime_call('store_values', [ast.Name(lista, ast.Load()), ast.Name(valores, ast.Load())])),
+        ]
+
+    def visit_definicao_loop(self, node):
+        return [
+            ast.Name(node.children[0], ast.Store()),
+            ast.Name(node.children[1], ast.Load()),
+        ]
+
+
+checker = Checker()
+generator = CodeGenerator()
 
 
 precedence = (
@@ -358,10 +1382,16 @@ def p_codigo(p):
     '''codigo : codigo comando KW_FPUNC
               | comando KW_FPUNC
     '''
+    # Os comandos de um bloco ficam numa lista só, em vez de uma cadeia
+    # aninhada, para que o tamanho do programa não vire profundidade de
+    # recursão no visit() e no to_python_ast().
     if p.slice[1].type == "codigo":
-        p[0] = Node('comando', children=[p[1], p[2]])
+        p[1].children.append(p[2])
+        p[0] = p[1]
     else:
-        p[0] = Node('comando', children=[p[1]])
+        p[0] = Node('comando')
+        # Única lista mutável da árvore: recebe os próximos comandos
+        p[0].children = [p[1]]
 
 
 def p_comando(p):
@@ -381,16 +1411,21 @@ def p_declaracao_funcao(p):
     '''declaracao : funcao_inicio funcao_fim
                   | funcao_inicio KW_FUNC_OPEN_ARGS lista_params funcao_fim
     '''
+    name, memo = p[1]
+    datatype = 'memorizado' if memo else None
     if p.slice[2].type == "funcao_fim":
-        p[0] = Node('funcao', children=[p[2]], leaf=p[1])
+        p[0] = Node('funcao', children=[p[2]], leaf=name, datatype=datatype, lineno=p.lineno(1))
     else:
-        p[0] = Node('funcao', children=[p[3], p[4]], leaf=p[1])
+        p[0] = Node('funcao', children=[p[3], p[4]], leaf=name, datatype=datatype, lineno=p.lineno(1))
 
 
 def p_declaracao_funcao_inicio(p):
     '''funcao_inicio : KW_FUNCTION IDENTIFIER
+                     | KW_FUNCTION KW_MEMO IDENTIFIER
     '''
-    p[0] = p[2]
+    # (nome, se é memorizada)
+    p[0] = (p[len(p) - 1], len(p) == 4)
+    p.set_lineno(0, p.lineno(1))
 
 
 def p_declaracao_funcao_fim(p):
@@ -423,6 +1458,13 @@ def p_tipo(p):
     p[0] = p[1]
 
 
+def p_tipo_lista(p):
+    '''tipo : KW_LIST KW_OF KW_INT
+            | KW_LIST KW_OF KW_FLOAT
+    '''
+    p[0] = '{} {} {}'.format(p[1], p[2], p[3])
+
+
 def p_lista_atribuicoes(p):
     '''lista_atribuicoes : lista_atribuicoes KW_FUNC_ARGS_SEP atribuicao
                          | atribuicao
@@ -445,7 +1487,7 @@ def p_atribuicao_valor(p):
 
 def p_atribuicao_lista(p):
     'atribuicao : IDENTIFIER KW_IS expressao KW_TO expressao'
-    range = Node('range', children=[p[3], p[5]])
+    range = Node('range', children=[p[3], p[5]], lineno=p.lineno(4))
     p[0] = Node('atribuicao', children=[p[1], range], leaf=p[2])
 
 
@@ -476,7 +1518,7 @@ def p_acao_atribuicao_vetor(p):
 def p_acao_enquanto(p):
     '''acao : KW_WHILE expressao fim_loop'''
     n1 = Node('teste', children=[p[2]])
-    p[0] = Node('enquanto', children=[n1, p[3]])
+    p[0] = Node('enquanto', children=[n1, p[3]], lineno=p.lineno(1))
 
 
 def p_acao_bota(p):
@@ -487,7 +1529,13 @@ def p_acao_bota(p):
 def p_acao_para(p):
     '''acao : KW_FOR IDENTIFIER KW_IN IDENTIFIER fim_loop'''
     definicao = Node('definicao_loop', children=[p[2], p[4]], leaf=p[3])
-    p[0] = Node('para', children=[definicao, p[5]])
+    p[0] = Node('para', children=[definicao, p[5]], lineno=p.lineno(1))
+
+
+def p_acao_para_paralelo(p):
+    '''acao : KW_FOR KW_EACH IDENTIFIER KW_IN IDENTIFIER KW_IN KW_PARALLEL fim_loop'''
+    definicao = Node('definicao_loop', children=[p[3], p[5]], leaf=p[4])
+    p[0] = Node('para_paralelo', children=[definicao, p[8]], lineno=p.lineno(1))
 
 
 def p_fim_loop(p):
@@ -647,20 +1695,298 @@ def p_error(p):
     print("Syntax error in input!")
 
 
-parser = yacc.yacc()
-
-if (len(sys.argv) < 2):
-    print('Uso: {} ARQUIVO_FONTE'.format(sys.argv[0]))
-else:
-    file = open(sys.argv[1], 'r')
-    data = file.read();
-    myast = parser.parse(data)
+_parser = None
+
+
+TABELAS = os.path.dirname(os.path.abspath(__file__))
+
+
+def get_parser():
+    # O PLY só é carregado quando for preciso compilar de verdade. As tabelas
+    # vêm do parsetab.py distribuído com o código e nada é escrito em disco.
+    global _parser
+    if _parser is None:
+        from ply import yacc
+        from scanner import tokens
+        _parser = yacc.yacc(optimize=1, debug=False, write_tables=False,
+                            tabmodule='parsetab', outputdir=TABELAS)
+    return _parser
+
+
+def write_tables():
+    # Regenera lextab.py e parsetab.py. Precisa ser rodado depois de qualquer
+    # mudança nos tokens ou na gramática, já que no modo otimizado o PLY não
+    # confere se as tabelas estão atualizadas.
+    for nome in ('lextab.py', 'parsetab.py'):
+        caminho = os.path.join(TABELAS, nome)
+        if os.path.exists(caminho):
+            os.remove(caminho)
+    from ply import yacc
+    from scanner import tokens
+    yacc.yacc(debug=False, write_tables=True, tabmodule='parsetab', outputdir=TABELAS)
+
+
+def compile_source(data, lineno=1, statement=False, filename="<ast>"):
+    # Retorna as mensagens do parser/checagem e o código compilado, ou None
+    # no lugar do código se houve erro de sintaxe. Com statement=True compila
+    # um comando do modo por comando: a checagem continua de onde o comando
+    # anterior parou e as variáveis ficam no namespace compartilhado.
+    mensagens, tree = source_tree(data, lineno, statement)
+    if tree is None:
+        return mensagens, None
+    try:
+        code = compile(tree, filename=filename, mode="exec")
+    except Exception:
+        # As mensagens da checagem saem antes do erro, em vez de se perderem
+        sys.stdout.write(mensagens)
+        raise
+    return mensagens, code
+
+
+def source_tree(data, lineno=1, statement=False):
+    # Como compile_source(), mas retorna a árvore do módulo Python em vez do
+    # código compilado. As fases são as funções abaixo, que o bench.py chama
+    # uma a uma para medir o tempo de cada uma.
+    from scanner import scan
+    saida = io.StringIO()
+    try:
+        with contextlib.redirect_stdout(saida):
+            myast = parse_tokens(scan(data, lineno))
+            if myast is None:
+                return saida.getvalue(), None
+            check_tree(myast, statement)
+        myast = optimize_tree(myast, statement)
+        #print(myast.pretty())
+        tree = module_ast(myast, statement)
+    except Exception:
+        # As mensagens da checagem saem antes do erro, em vez de se perderem
+        sys.stdout.write(saida.getvalue())
+        raise
+    return saida.getvalue(), tree
+
+
+def parse_tokens(tokens):
+    # Árvore do programa, ou None se houve erro de sintaxe
+    from scanner import lexer
+    return get_parser().parse(lexer=lexer, tokenfunc=tokens.token)
+
+
+def check_tree(myast, statement=False):
+    # No modo por comando a checagem continua de onde o comando anterior
+    # parou
+    global scope
+    if not statement:
+        scope = SymbolTable()
+        functions.clear()
+    local_functions.clear()
+    myast.collect_functions()
     myast.visit()
-    #print(myast.pretty())
+
+
+def optimize_tree(myast, statement=False):
+    inlinable.clear()
+    if options['optimize']:
+        # No modo por comando uma função pode ser redefinida depois da
+        # chamada, então nada é copiado
+        if options['optimize'] >= 2 and not options['profile'] and not statement:
+            inlinable.update(inline_candidates(myast))
+        myast = myast.optimize(options['optimize'])
+    return myast
+
+
+def module_ast(myast, statement=False):
     tree = myast.to_python_ast()
-    tree = ast.Module(tree)
+    if options['optimize'] and not statement:
+        # O programa vira o corpo de uma função, então as variáveis são
+        # locais (LOAD_FAST/STORE_FAST) em vez de globais. As funções
+        # 'define' ficam aninhadas e continuam enxergando essas variáveis
+        # por closure, como enxergavam as globais.
+        main = ast.FunctionDef(MAIN, make_arguments([]), tree, [], None)
+        tree = [main, ast.Expr(ast.Call(ast.Name(MAIN, ast.Load()), [], []))]
+    prologo = [ast.Import([ast.alias('runtime', RUNTIME)])]
+    if options['profile']:
+        prologo.append(ast.Expr(runtime_call('start_profile', [])))
+    if options['budget']:
+        # _passos = _tches.budget(passos, segundos, bytes)
+        # _passo = next
+        limites = [ast.NameConstant(None) if limite is None else ast.Num(limite)
+                   for limite in options['budget']]
+        prologo.append(ast.Assign([ast.Name('_passos', ast.Store())], runtime_call('budget', limites)))
+        prologo.append(ast.Assign([ast.Name('_passo', ast.Store())], ast.Name('next', ast.Load())))
+    tree[:0] = prologo
+    tree = ast.Module(body=tree, type_ignores=[])
     ast.fix_missing_locations(tree)
     #print(ast.dump(tree))
-    exec(compile(tree, filename="<ast>", mode="exec"))
-
-    file.close()
+    return tree
+
+
+def split_line(line, depth=0, last=None):
+    # Acompanha os blocos de uma linha: 'se', 'faça' e 'como' abrem blocos e
+    # 'e deu' fecha ('senão se' continua o mesmo bloco). Retorna as posições
+    # logo depois de cada '.' que termina um comando de nível superior, a
+    # profundidade e o último token no fim da linha e se sobrou algum token
+    # depois do último desses '.'.
+    from scanner import scan
+    ends = []
+    pending = False
+    for kind, lexpos in scan(line).positions():
+        pending = True
+        if kind == 'KW_IF' and last != 'KW_ELSE':
+            depth += 1
+        elif kind == 'KW_LOOP_OPEN' or kind == 'KW_FUNC_OPEN':
+            depth += 1
+        elif kind == 'KW_DONE' and last == 'KW_AND':
+            depth -= 1
+        elif kind == 'KW_FPUNC' and depth <= 0:
+            ends.append(lexpos + 1)
+            pending = False
+            depth = 0
+        last = kind
+    return ends, depth, last, pending
+
+
+def statements(file):
+    # Divide a entrada em comandos de nível superior sem ler tudo de uma vez.
+    # Um comando termina no '.' fora de qualquer bloco. Gera (linha inicial,
+    # texto do comando). Erros léxicos são mostrados depois, pelo parser.
+    depth = 0
+    last = None
+    pending = []
+    tokens_pending = False
+    start = 1
+    lineno = 0
+    for line in iter(file.readline, ''):
+        lineno += 1
+        if not pending:
+            start = lineno
+        inicio = 0
+        ends, depth, last, line_pending = split_line(line, depth, last)
+        for fim in ends:
+            pending.append(line[inicio:fim])
+            yield start, ''.join(pending)
+            pending = []
+            tokens_pending = False
+            start = lineno
+            inicio = fim
+        tokens_pending = tokens_pending or line_pending
+        pending.append(line[inicio:])
+    if tokens_pending:
+        # Comando incompleto no fim da entrada: o parser aponta o erro
+        yield start, ''.join(pending)
+
+
+def budget_option(passos=None, segundos=None, megabytes=None):
+    # Valor de options['budget'] para os limites da linha de comando
+    if passos is None and segundos is None and megabytes is None:
+        return None
+    return (passos, segundos, megabytes * 1024 * 1024 if megabytes is not None else None)
+
+
+def run_code(code, env):
+    # Executa um programa compilado. Um limite de execução excedido encerra
+    # com uma mensagem em vez do traceback.
+    import runtime
+    try:
+        exec(code, env)
+    except (runtime.BudgetExceeded, MemoryError) as e:
+        erro = runtime.budget_error(e, code.co_filename)
+        if erro is None:
+            raise
+        runtime.flush()
+        print('Execução interrompida: {}'.format(erro), file=sys.stderr)
+        sys.exit(1)
+    finally:
+        # A saída pendente aparece antes de um eventual traceback
+        runtime.flush()
+
+
+def run_stream(file, env):
+    # Executa cada comando assim que ele termina, mantendo as variáveis e
+    # funções entre um comando e outro
+    global scope
+    scope = SymbolTable()
+    functions.clear()
+    for lineno, data in statements(file):
+        mensagens, code = compile_source(data, lineno, statement=True)
+        sys.stdout.write(mensagens)
+        if code is not None:
+            run_code(code, env)
+        sys.stdout.flush()
+
+
+if __name__ == "__main__":
+    import argparse
+
+    argparser = argparse.ArgumentParser()
+    argparser.add_argument('arquivo', metavar='ARQUIVO_FONTE', nargs='?',
+                           help='"-" lê o programa da entrada padrão')
+    argparser.add_argument('--sem-cache', action='store_true',
+                           help='não usa o cache de programas compilados')
+    argparser.add_argument('--limpa-cache', action='store_true',
+                           help='apaga o cache antes de executar')
+    argparser.add_argument('--listas-preguicosas', action='store_true',
+                           help='listas "A a B" só são criadas na primeira modificação')
+    argparser.add_argument('--por-comando', action='store_true',
+                           help='executa cada comando assim que ele termina de ser lido')
+    argparser.add_argument('--profile', action='store_true',
+                           help='mostra chamadas e tempo das funções e iterações dos laços ao sair')
+    argparser.add_argument('-O', dest='otimizacao', type=int, choices=[0, 1, 2], default=1,
+                           help='nível de otimização (padrão: 1)')
+    argparser.add_argument('-j', '--processos', type=int,
+                           help='processos dos laços "em paralelo" (padrão: um por núcleo)')
+    argparser.add_argument('--tamanho-memo', type=int,
+                           help='resultados guardados por função memorizada (padrão: 1024)')
+    argparser.add_argument('--buffer-saida', type=int, metavar='CARACTERES',
+                           help='caracteres de "mostra" guardados antes de escrever '
+                                '(padrão: 65536, ou 0 num terminal)')
+    argparser.add_argument('--limite-passos', type=int, metavar='PASSOS',
+                           help='interrompe o programa depois de tantas voltas de laço e chamadas de função')
+    argparser.add_argument('--limite-tempo', type=float, metavar='SEGUNDOS',
+                           help='interrompe o programa depois de tantos segundos')
+    argparser.add_argument('--limite-memoria', type=int, metavar='MB',
+                           help='interrompe o programa se ele alocar mais que tantos MB')
+    argparser.add_argument('--gera-tabelas', action='store_true',
+                           help='regenera as tabelas do scanner e do parser')
+    args = argparser.parse_args()
+    options['lazy_ranges'] = args.listas_preguicosas
+    options['profile'] = args.profile
+    options['optimize'] = args.otimizacao
+    options['budget'] = budget_option(args.limite_passos, args.limite_tempo, args.limite_memoria)
+    import runtime
+    runtime.workers = args.processos
+    runtime.memo_size = args.tamanho_memo or runtime.memo_size
+    if args.buffer_saida is not None:
+        runtime.buffer_size = args.buffer_saida
+
+    env = {'__name__': '__main__'}
+
+    if args.gera_tabelas:
+        write_tables()
+    elif args.arquivo is None:
+        argparser.error('informe o ARQUIVO_FONTE')
+    elif args.arquivo == '-':
+        run_stream(sys.stdin, env)
+    elif args.por_comando:
+        with open(args.arquivo, 'r') as file:
+            run_stream(file, env)
+    else:
+        file = open(args.arquivo, 'r')
+        data = file.read();
+        file.close()
+
+        if args.limpa_cache:
+            cache.clear(args.arquivo)
+
+        compilado = None
+        if not args.sem_cache:
+            compilado = cache.load(args.arquivo, data, options)
+        if compilado is None:
+            compilado = compile_source(data)
+            if not args.sem_cache and compilado[1] is not None:
+                cache.store(args.arquivo, data, options, *compilado)
+
+        mensagens, code = compilado
+        sys.stdout.write(mensagens)
+        if code is None:
+            sys.exit(1)
+        run_code(code, env)
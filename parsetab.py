@@ -0,0 +1,101 @@
+
+# parsetab.py
+# This file is automatically generated. Do not edit.
+_tabversion = '3.10'
+
+_lr_method = 'LALR'
+
+_lr_signature = 'rightKW_FUNC_OPEN_ARGSKW_PRINTKW_INPUTIDENTIFIERKW_FUNC_ARGS_SEPleftKW_ORKW_ANDKW_NOTleftCOMPKW_ISleftOP_ADDOP_SUBleftOP_MULOP_DIVOP_BYleftOP_INCOP_DECleftOP_EXPPAR_OPEN PAR_CLOSE BRACKET_OPEN BRACKET_CLOSE IDENTIFIER INT_NUMBER FLOAT_NUMBER STRING KW_FUNC_ARGS_SEP KW_FPUNC OP_ADD OP_SUB OP_MUL OP_DIV OP_BY OP_INC OP_DEC OP_EXP KW_IF KW_IF_OPEN KW_ELSE KW_FOR KW_LOOP_OPEN KW_WHILE KW_INT KW_FLOAT KW_STRING KW_LIST KW_OF KW_PRINT KW_INPUT TRUE FALSE KW_FUNCTION KW_FUNC_OPEN_ARGS KW_FUNC_OPEN KW_NOT KW_IS KW_EQUAL KW_TO KW_DIFF KW_LESS KW_THAN KW_OR KW_GREATER KW_AND KW_DONE KW_RETURN KW_ITS KW_OK KW_PUT KW_IN KW_EACH KW_PARALLEL KW_MEMOcodigo : codigo comando KW_FPUNC\n              | comando KW_FPUNC\n    comando : declaracao\n               | acao\n    declaracao : tipo lista_atribuicoes\n    declaracao : funcao_inicio funcao_fim\n                  | funcao_inicio KW_FUNC_OPEN_ARGS lista_params funcao_fim\n    funcao_inicio : KW_FUNCTION IDENTIFIER\n                     | KW_FUNCTION KW_MEMO IDENTIFIER\n    funcao_fim : KW_FUNC_OPEN codigo KW_AND KW_DONE\n    lista_params : lista_params KW_FUNC_ARGS_SEP param\n                    | param\n    param : tipo IDENTIFIERtipo : KW_INT\n            | KW_FLOAT\n            | KW_STRING\n            | KW_LIST\n    tipo : KW_LIST KW_OF KW_INT\n            | KW_LIST KW_OF KW_FLOAT\n    lista_atribuicoes : lista_atribuicoes KW_FUNC_ARGS_SEP atribuicao\n                         | atribuicao\n    atribuicao : IDENTIFIERatribuicao : IDENTIFIER KW_IS expressaoatribuicao : IDENTIFIER KW_IS expressao KW_TO expressaoacao : expressao\n            | condicao\n    acao : KW_RETURN expressaoacao : IDENTIFIER KW_IS expressaoacao : IDENTIFIER BRACKET_OPEN expressao BRACKET_CLOSE KW_IS expressaoacao : KW_WHILE expressao fim_loopacao : KW_PUT expressao KW_IN IDENTIFIERacao : KW_FOR IDENTIFIER KW_IN IDENTIFIER fim_loopacao : KW_FOR KW_EACH IDENTIFIER KW_IN IDENTIFIER KW_IN KW_PARALLEL fim_loopfim_loop :  KW_LOOP_OPEN codigo KW_AND KW_DONEcondicao : KW_IF expressao KW_IF_OPEN codigo fim_condicaofim_condicao : KW_ELSE condicao\n                    | KW_ITS KW_OK KW_IF_OPEN codigo fim_condicao\n                    | KW_AND KW_DONE\n    expressao : PAR_OPEN expressao PAR_CLOSEexpressao : expressao OP_ADD expressao\n                 | expressao OP_SUB expressao\n                 | expressao OP_MUL expressao\n                 | expressao OP_DIV OP_BY expressao\n                 | expressao OP_EXP expressao\n                 | expressao KW_AND expressao\n                 | expressao KW_OR expressao\n                 | expressao comp expressao %prec COMP\n    expressao : KW_NOT expressao\n                 | OP_INC expressao\n                 | OP_DEC expressao\n    expressao : INT_NUMBER\n                 | FLOAT_NUMBER\n                 | STRING\n                 | TRUE\n                 | FALSE\n                 | IDENTIFIER\n    expressao : IDENTIFIER BRACKET_OPEN expressao BRACKET_CLOSEexpressao : func lista_args\n                 | IDENTIFIER KW_FUNC_OPEN_ARGS lista_args\n    func : KW_PRINT\n            | KW_INPUT\n    lista_args : lista_args KW_FUNC_ARGS_SEP expressao\n                  | expressao\n    comp : KW_IS comp2comp2 : comp3 comp4comp2 : comp5\n             | KW_DIFF\n    comp3 : KW_GREATER\n             | KW_LESScomp4 : KW_THANcomp4 : KW_OR comp5comp5 : KW_EQUAL KW_TO'
+    
+_lr_action_items = {'KW_RETURN':([0,1,33,39,68,74,95,104,118,123,145,147,],[9,9,-2,9,-1,9,9,9,9,9,9,9,]),'IDENTIFIER':([0,1,5,9,11,12,13,14,15,16,17,18,19,20,21,22,28,29,30,31,33,39,40,41,42,44,45,46,47,51,52,53,57,60,68,69,70,73,74,78,83,85,86,90,95,96,97,99,100,103,104,112,113,115,118,121,123,124,127,129,145,147,],[10,10,36,50,50,50,56,-14,-15,-16,-17,59,50,50,50,50,50,50,-60,-61,-2,10,50,50,50,50,50,50,50,50,50,50,98,101,-1,36,50,109,10,50,-64,-66,-67,50,10,119,120,-18,-19,50,10,-65,-70,-72,10,132,10,50,-71,50,10,10,]),'KW_WHILE':([0,1,33,39,68,74,95,104,118,123,145,147,],[11,11,-2,11,-1,11,11,11,11,11,11,11,]),'KW_PUT':([0,1,33,39,68,74,95,104,118,123,145,147,],[12,12,-2,12,-1,12,12,12,12,12,12,12,]),'KW_FOR':([0,1,33,39,68,74,95,104,118,123,145,147,],[13,13,-2,13,-1,13,13,13,13,13,13,13,]),'KW_INT':([0,1,33,38,39,58,68,74,95,104,108,118,123,145,147,],[14,14,-2,14,14,99,-1,14,14,14,14,14,14,14,14,]),'KW_FLOAT':([0,1,33,38,39,58,68,74,95,104,108,118,123,145,147,],[15,15,-2,15,15,100,-1,15,15,15,15,15,15,15,15,]),'KW_STRING':([0,1,33,38,39,68,74,95,104,108,118,123,145,147,],[16,16,-2,16,16,-1,16,16,16,16,16,16,16,16,]),'KW_LIST':([0,1,33,38,39,68,74,95,104,108,118,123,145,147,],[17,17,-2,17,17,-1,17,17,17,17,17,17,17,17,]),'KW_FUNCTION':([0,1,33,39,68,74,95,104,118,123,145,147,],[18,18,-2,18,-1,18,18,18,18,18,18,18,]),'PAR_OPEN':([0,1,9,11,12,19,20,21,22,28,29,30,31,33,39,40,41,42,44,45,46,47,51,52,53,68,70,74,78,83,85,86,90,95,103,104,112,113,115,118,123,124,127,129,145,147,],[19,19,19,19,19,19,19,19,19,19,19,-60,-61,-2,19,19,19,19,19,19,19,19,19,19,19,-1,19,19,19,-64,-66,-67,19,19,19,19,-65,-70,-72,19,19,19,-71,19,19,19,]),'KW_NOT':([0,1,9,11,12,19,20,21,22,28,29,30,31,33,39,40,41,42,44,45,46,47,51,52,53,68,70,74,78,83,85,86,90,95,103,104,112,113,115,118,123,124,127,129,145,147,],[20,20,20,20,20,20,20,20,20,20,20,-60,-61,-2,20,20,20,20,20,20,20,20,20,20,20,-1,20,20,20,-64,-66,-67,20,20,20,20,-65,-70,-72,20,20,20,-71,20,20,20,]),'OP_INC':([0,1,9,11,12,19,20,21,22,28,29,30,31,33,39,40,41,42,44,45,46,47,51,52,53,68,70,74,78,83,85,86,90,95,103,104,112,113,115,118,123,124,127,129,145,147,],[21,21,21,21,21,21,21,21,21,21,21,-60,-61,-2,21,21,21,21,21,21,21,21,21,21,21,-1,21,21,21,-64,-66,-67,21,21,21,21,-65,-70,-72,21,21,21,-71,21,21,21,]),'OP_DEC':([0,1,9,11,12,19,20,21,22,28,29,30,31,33,39,40,41,42,44,45,46,47,51,52,53,68,70,74,78,83,85,86,90,95,103,104,112,113,115,118,123,124,127,129,145,147,],[22,22,22,22,22,22,22,22,22,22,22,-60,-61,-2,22,22,22,22,22,22,22,22,22,22,22,-1,22,22,22,-64,-66,-67,22,22,22,22,-65,-70,-72,22,22,22,-71,22,22,22,]),'INT_NUMBER':([0,1,9,11,12,19,20,21,22,28,29,30,31,33,39,40,41,42,44,45,46,47,51,52,53,68,70,74,78,83,85,86,90,95,103,104,112,113,115,118,123,124,127,129,145,147,],[23,23,23,23,23,23,23,23,23,23,23,-60,-61,-2,23,23,23,23,23,23,23,23,23,23,23,-1,23,23,23,-64,-66,-67,23,23,23,23,-65,-70,-72,23,23,23,-71,23,23,23,]),'FLOAT_NUMBER':([0,1,9,11,12,19,20,21,22,28,29,30,31,33,39,40,41,42,44,45,46,47,51,52,53,68,70,74,78,83,85,86,90,95,103,104,112,113,115,118,123,124,127,129,145,147,],[24,24,24,24,24,24,24,24,24,24,24,-60,-61,-2,24,24,24,24,24,24,24,24,24,24,24,-1,24,24,24,-64,-66,-67,24,24,24,24,-65,-70,-72,24,24,24,-71,24,24,24,]),'STRING':([0,1,9,11,12,19,20,21,22,28,29,30,31,33,39,40,41,42,44,45,46,47,51,52,53,68,70,74,78,83,85,86,90,95,103,104,112,113,115,118,123,124,127,129,145,147,],[25,25,25,25,25,25,25,25,25,25,25,-60,-61,-2,25,25,25,25,25,25,25,25,25,25,25,-1,25,25,25,-64,-66,-67,25,25,25,25,-65,-70,-72,25,25,25,-71,25,25,25,]),'TRUE':([0,1,9,11,12,19,20,21,22,28,29,30,31,33,39,40,41,42,44,45,46,47,51,52,53,68,70,74,78,83,85,86,90,95,103,104,112,113,115,118,123,124,127,129,145,147,],[26,26,26,26,26,26,26,26,26,26,26,-60,-61,-2,26,26,26,26,26,26,26,26,26,26,26,-1,26,26,26,-64,-66,-67,26,26,26,26,-65,-70,-72,26,26,26,-71,26,26,26,]),'FALSE':([0,1,9,11,12,19,20,21,22,28,29,30,31,33,39,40,41,42,44,45,46,47,51,52,53,68,70,74,78,83,85,86,90,95,103,104,112,113,115,118,123,124,127,129,145,147,],[27,27,27,27,27,27,27,27,27,27,27,-60,-61,-2,27,27,27,27,27,27,27,27,27,27,27,-1,27,27,27,-64,-66,-67,27,27,27,27,-65,-70,-72,27,27,27,-71,27,27,27,]),'KW_IF':([0,1,33,39,68,74,95,104,118,123,134,145,147,],[29,29,-2,29,-1,29,29,29,29,29,29,29,29,]),'KW_PRINT':([0,1,9,11,12,19,20,21,22,28,29,30,31,33,39,40,41,42,44,45,46,47,51,52,53,68,70,74,78,83,85,86,90,95,103,104,112,113,115,118,123,124,127,129,145,147,],[30,30,30,30,30,30,30,30,30,30,30,-60,-61,-2,30,30,30,30,30,30,30,30,30,30,30,-1,30,30,30,-64,-66,-67,30,30,30,30,-65,-70,-72,30,30,30,-71,30,30,30,]),'KW_INPUT':([0,1,9,11,12,19,20,21,22,28,29,30,31,33,39,40,41,42,44,45,46,47,51,52,53,68,70,74,78,83,85,86,90,95,103,104,112,113,115,118,123,124,127,129,145,147,],[31,31,31,31,31,31,31,31,31,31,31,-60,-61,-2,31,31,31,31,31,31,31,31,31,31,31,-1,31,31,31,-64,-66,-67,31,31,31,31,-65,-70,-72,31,31,31,-71,31,31,31,]),'$end':([1,33,68,],[0,-2,-1,]),'KW_FPUNC':([2,3,4,7,8,10,23,24,25,26,27,32,34,35,36,37,49,50,62,63,64,65,66,75,76,77,79,80,81,82,91,93,94,102,105,106,107,111,117,119,122,126,128,131,133,137,138,139,141,143,146,148,],[33,-3,-4,-25,-26,-56,-51,-52,-53,-54,-55,68,-5,-21,-22,-6,-27,-56,-48,-49,-50,-58,-63,-40,-41,-42,-44,-45,-46,-47,-28,-59,-30,-39,-20,-23,-7,-43,-57,-31,-62,-10,-57,-32,-35,-24,-29,-34,-36,-38,-33,-37,]),'KW_FUNC_OPEN_ARGS':([6,10,50,59,101,],[38,53,53,-8,-9,]),'KW_FUNC_OPEN':([6,59,71,72,101,109,125,],[39,-8,39,-12,-9,-13,-11,]),'OP_ADD':([7,10,23,24,25,26,27,49,50,54,55,61,62,63,64,65,66,67,75,76,77,79,80,81,82,91,92,93,102,106,111,116,117,122,128,137,138,],[40,-56,-51,-52,-53,-54,-55,40,-56,40,40,40,40,-49,-50,-58,40,40,-40,-41,-42,-44,40,40,40,40,40,-59,-39,40,-43,40,-57,40,-57,40,40,]),'OP_SUB':([7,10,23,24,25,26,27,49,50,54,55,61,62,63,64,65,66,67,75,76,77,79,80,81,82,91,92,93,102,106,111,116,117,122,128,137,138,],[41,-56,-51,-52,-53,-54,-55,41,-56,41,41,41,41,-49,-50,-58,41,41,-40,-41,-42,-44,41,41,41,41,41,-59,-39,41,-43,41,-57,41,-57,41,41,]),'OP_MUL':([7,10,23,24,25,26,27,49,50,54,55,61,62,63,64,65,66,67,75,76,77,79,80,81,82,91,92,93,102,106,111,116,117,122,128,137,138,],[42,-56,-51,-52,-53,-54,-55,42,-56,42,42,42,42,-49,-50,-58,42,42,42,42,-42,-44,42,42,42,42,42,-59,-39,42,-43,42,-57,42,-57,42,42,]),'OP_DIV':([7,10,23,24,25,26,27,49,50,54,55,61,62,63,64,65,66,67,75,76,77,79,80,81,82,91,92,93,102,106,111,116,117,122,128,137,138,],[43,-56,-51,-52,-53,-54,-55,43,-56,43,43,43,43,-49,-50,-58,43,43,43,43,-42,-44,43,43,43,43,43,-59,-39,43,-43,43,-57,43,-57,43,43,]),'OP_EXP':([7,10,23,24,25,26,27,49,50,54,55,61,62,63,64,65,66,67,75,76,77,79,80,81,82,91,92,93,102,106,111,116,117,122,128,137,138,],[44,-56,-51,-52,-53,-54,-55,44,-56,44,44,44,44,44,44,-58,44,44,44,44,44,-44,44,44,44,44,44,-59,-39,44,44,44,-57,44,-57,44,44,]),'KW_AND':([7,10,23,24,25,26,27,33,49,50,54,55,61,62,63,64,65,66,67,68,74,75,76,77,79,80,81,82,91,92,93,102,106,111,116,117,118,122,123,128,137,138,147,],[45,-56,-51,-52,-53,-54,-55,-2,45,-56,45,45,45,-48,-49,-50,-58,45,45,-1,110,-40,-41,-42,-44,-45,-46,-47,45,45,-59,-39,45,-43,45,-57,130,45,136,-57,45,45,136,]),'KW_OR':([7,10,23,24,25,26,27,49,50,54,55,61,62,63,64,65,66,67,75,76,77,79,80,81,82,84,87,88,91,92,93,102,106,111,116,117,122,128,137,138,],[46,-56,-51,-52,-53,-54,-55,46,-56,46,46,46,-48,-49,-50,-58,46,46,-40,-41,-42,-44,-45,-46,-47,114,-68,-69,46,46,-59,-39,46,-43,46,-57,46,-57,46,46,]),'KW_IS':([7,10,23,24,25,26,27,36,49,50,54,55,61,62,63,64,65,66,67,75,76,77,79,80,81,82,91,92,93,102,106,111,116,117,122,128,137,138,],[48,51,-51,-52,-53,-54,-55,70,48,-56,48,48,48,48,-49,-50,-58,48,48,-40,-41,-42,-44,48,48,-47,48,48,-59,-39,48,-43,48,129,48,-57,48,48,]),'BRACKET_OPEN':([10,50,],[52,90,]),'KW_EACH':([13,],[57,]),'KW_OF':([17,],[58,]),'KW_MEMO':([18,],[60,]),'KW_LOOP_OPEN':([23,24,25,26,27,50,54,62,63,64,65,66,75,76,77,79,80,81,82,93,102,111,120,122,128,144,],[-51,-52,-53,-54,-55,-56,95,-48,-49,-50,-58,-63,-40,-41,-42,-44,-45,-46,-47,-59,-39,-43,95,-62,-57,95,]),'KW_IN':([23,24,25,26,27,50,55,56,62,63,64,65,66,75,76,77,79,80,81,82,93,98,102,111,122,128,132,],[-51,-52,-53,-54,-55,-56,96,97,-48,-49,-50,-58,-63,-40,-41,-42,-44,-45,-46,-47,-59,121,-39,-43,-62,-57,140,]),'PAR_CLOSE':([23,24,25,26,27,50,61,62,63,64,65,66,75,76,77,79,80,81,82,93,102,111,122,128,],[-51,-52,-53,-54,-55,-56,102,-48,-49,-50,-58,-63,-40,-41,-42,-44,-45,-46,-47,-59,-39,-43,-62,-57,]),'KW_FUNC_ARGS_SEP':([23,24,25,26,27,34,35,36,50,62,63,64,65,66,71,72,75,76,77,79,80,81,82,93,102,105,106,109,111,122,125,128,137,],[-51,-52,-53,-54,-55,69,-21,-22,-56,-48,-49,-50,103,-63,108,-12,-40,-41,-42,-44,-45,-46,-47,103,-39,-20,-23,-13,-43,-62,-11,-57,-24,]),'KW_IF_OPEN':([23,24,25,26,27,50,62,63,64,65,66,67,75,76,77,79,80,81,82,93,102,111,122,128,142,],[-51,-52,-53,-54,-55,-56,-48,-49,-50,-58,-63,104,-40,-41,-42,-44,-45,-46,-47,-59,-39,-43,-62,-57,145,]),'BRACKET_CLOSE':([23,24,25,26,27,50,62,63,64,65,66,75,76,77,79,80,81,82,92,93,102,111,116,122,128,],[-51,-52,-53,-54,-55,-56,-48,-49,-50,-58,-63,-40,-41,-42,-44,-45,-46,-47,117,-59,-39,-43,128,-62,-57,]),'KW_TO':([23,24,25,26,27,50,62,63,64,65,66,75,76,77,79,80,81,82,89,93,102,106,111,122,128,],[-51,-52,-53,-54,-55,-56,-48,-49,-50,-58,-63,-40,-41,-42,-44,-45,-46,-47,115,-59,-39,124,-43,-62,-57,]),'KW_ELSE':([33,68,123,147,],[-2,-1,134,134,]),'KW_ITS':([33,68,123,147,],[-2,-1,135,135,]),'OP_BY':([43,],[78,]),'KW_DIFF':([48,],[86,]),'KW_GREATER':([48,],[87,]),'KW_LESS':([48,],[88,]),'KW_EQUAL':([48,114,],[89,89,]),'KW_THAN':([84,87,88,],[113,-68,-69,]),'KW_DONE':([110,130,136,],[126,139,143,]),'KW_OK':([135,],[142,]),'KW_PARALLEL':([140,],[144,]),}
+
+_lr_action = {}
+for _k, _v in _lr_action_items.items():
+   for _x,_y in zip(_v[0],_v[1]):
+      if not _x in _lr_action:  _lr_action[_x] = {}
+      _lr_action[_x][_k] = _y
+del _lr_action_items
+
+_lr_goto_items = {'codigo':([0,39,95,104,145,],[1,74,118,123,147,]),'comando':([0,1,39,74,95,104,118,123,145,147,],[2,32,2,32,2,2,32,32,2,32,]),'declaracao':([0,1,39,74,95,104,118,123,145,147,],[3,3,3,3,3,3,3,3,3,3,]),'acao':([0,1,39,74,95,104,118,123,145,147,],[4,4,4,4,4,4,4,4,4,4,]),'tipo':([0,1,38,39,74,95,104,108,118,123,145,147,],[5,5,73,5,5,5,5,73,5,5,5,5,]),'funcao_inicio':([0,1,39,74,95,104,118,123,145,147,],[6,6,6,6,6,6,6,6,6,6,]),'expressao':([0,1,9,11,12,19,20,21,22,28,29,39,40,41,42,44,45,46,47,51,52,53,70,74,78,90,95,103,104,118,123,124,129,145,147,],[7,7,49,54,55,61,62,63,64,66,67,7,75,76,77,79,80,81,82,91,92,66,106,7,111,116,7,122,7,7,7,137,138,7,7,]),'condicao':([0,1,39,74,95,104,118,123,134,145,147,],[8,8,8,8,8,8,8,8,141,8,8,]),'func':([0,1,9,11,12,19,20,21,22,28,29,39,40,41,42,44,45,46,47,51,52,53,70,74,78,90,95,103,104,118,123,124,129,145,147,],[28,28,28,28,28,28,28,28,28,28,28,28,28,28,28,28,28,28,28,28,28,28,28,28,28,28,28,28,28,28,28,28,28,28,28,]),'lista_atribuicoes':([5,],[34,]),'atribuicao':([5,69,],[35,105,]),'funcao_fim':([6,71,],[37,107,]),'comp':([7,49,54,55,61,62,63,64,66,67,75,76,77,79,80,81,82,91,92,106,111,116,122,137,138,],[47,47,47,47,47,47,47,47,47,47,47,47,47,47,47,47,47,47,47,47,47,47,47,47,47,]),'lista_args':([28,53,],[65,93,]),'lista_params':([38,],[71,]),'param':([38,108,],[72,125,]),'comp2':([48,],[83,]),'comp3':([48,],[84,]),'comp5':([48,114,],[85,127,]),'fim_loop':([54,120,144,],[94,131,146,]),'comp4':([84,],[112,]),'fim_condicao':([123,147,],[133,148,]),}
+
+_lr_goto = {}
+for _k, _v in _lr_goto_items.items():
+   for _x, _y in zip(_v[0], _v[1]):
+       if not _x in _lr_goto: _lr_goto[_x] = {}
+       _lr_goto[_x][_k] = _y
+del _lr_goto_items
+_lr_productions = [
+  ("S' -> codigo","S'",1,None,None,None),
+  ('codigo -> codigo comando KW_FPUNC','codigo',3,'p_codigo','parser.py',958),
+  ('codigo -> comando KW_FPUNC','codigo',2,'p_codigo','parser.py',959),
+  ('comando -> declaracao','comando',1,'p_comando','parser.py',974),
+  ('comando -> acao','comando',1,'p_comando','parser.py',975),
+  ('declaracao -> tipo lista_atribuicoes','declaracao',2,'p_declaracao','parser.py',981),
+  ('declaracao -> funcao_inicio funcao_fim','declaracao',2,'p_declaracao_funcao','parser.py',987),
+  ('declaracao -> funcao_inicio KW_FUNC_OPEN_ARGS lista_params funcao_fim','declaracao',4,'p_declaracao_funcao','parser.py',988),
+  ('funcao_inicio -> KW_FUNCTION IDENTIFIER','funcao_inicio',2,'p_declaracao_funcao_inicio','parser.py',999),
+  ('funcao_inicio -> KW_FUNCTION KW_MEMO IDENTIFIER','funcao_inicio',3,'p_declaracao_funcao_inicio','parser.py',1000),
+  ('funcao_fim -> KW_FUNC_OPEN codigo KW_AND KW_DONE','funcao_fim',4,'p_declaracao_funcao_fim','parser.py',1008),
+  ('lista_params -> lista_params KW_FUNC_ARGS_SEP param','lista_params',3,'p_lista_params','parser.py',1014),
+  ('lista_params -> param','lista_params',1,'p_lista_params','parser.py',1015),
+  ('param -> tipo IDENTIFIER','param',2,'p_param','parser.py',1024),
+  ('tipo -> KW_INT','tipo',1,'p_tipo','parser.py',1029),
+  ('tipo -> KW_FLOAT','tipo',1,'p_tipo','parser.py',1030),
+  ('tipo -> KW_STRING','tipo',1,'p_tipo','parser.py',1031),
+  ('tipo -> KW_LIST','tipo',1,'p_tipo','parser.py',1032),
+  ('tipo -> KW_LIST KW_OF KW_INT','tipo',3,'p_tipo_lista','parser.py',1038),
+  ('tipo -> KW_LIST KW_OF KW_FLOAT','tipo',3,'p_tipo_lista','parser.py',1039),
+  ('lista_atribuicoes -> lista_atribuicoes KW_FUNC_ARGS_SEP atribuicao','lista_atribuicoes',3,'p_lista_atribuicoes','parser.py',1045),
+  ('lista_atribuicoes -> atribuicao','lista_atribuicoes',1,'p_lista_atribuicoes','parser.py',1046),
+  ('atribuicao -> IDENTIFIER','atribuicao',1,'p_atribuicao','parser.py',1055),
+  ('atribuicao -> IDENTIFIER KW_IS expressao','atribuicao',3,'p_atribuicao_valor','parser.py',1060),
+  ('atribuicao -> IDENTIFIER KW_IS expressao KW_TO expressao','atribuicao',5,'p_atribuicao_lista','parser.py',1065),
+  ('acao -> expressao','acao',1,'p_acao_expressao','parser.py',1071),
+  ('acao -> condicao','acao',1,'p_acao_expressao','parser.py',1072),
+  ('acao -> KW_RETURN expressao','acao',2,'p_acao_retorna','parser.py',1078),
+  ('acao -> IDENTIFIER KW_IS expressao','acao',3,'p_acao_atribuicao','parser.py',1083),
+  ('acao -> IDENTIFIER BRACKET_OPEN expressao BRACKET_CLOSE KW_IS expressao','acao',6,'p_acao_atribuicao_vetor','parser.py',1089),
+  ('acao -> KW_WHILE expressao fim_loop','acao',3,'p_acao_enquanto','parser.py',1095),
+  ('acao -> KW_PUT expressao KW_IN IDENTIFIER','acao',4,'p_acao_bota','parser.py',1101),
+  ('acao -> KW_FOR IDENTIFIER KW_IN IDENTIFIER fim_loop','acao',5,'p_acao_para','parser.py',1106),
+  ('acao -> KW_FOR KW_EACH IDENTIFIER KW_IN IDENTIFIER KW_IN KW_PARALLEL fim_loop','acao',8,'p_acao_para_paralelo','parser.py',1112),
+  ('fim_loop -> KW_LOOP_OPEN codigo KW_AND KW_DONE','fim_loop',4,'p_fim_loop','parser.py',1118),
+  ('condicao -> KW_IF expressao KW_IF_OPEN codigo fim_condicao','condicao',5,'p_condicao','parser.py',1123),
+  ('fim_condicao -> KW_ELSE condicao','fim_condicao',2,'p_fim_condicao','parser.py',1129),
+  ('fim_condicao -> KW_ITS KW_OK KW_IF_OPEN codigo fim_condicao','fim_condicao',5,'p_fim_condicao','parser.py',1130),
+  ('fim_condicao -> KW_AND KW_DONE','fim_condicao',2,'p_fim_condicao','parser.py',1131),
+  ('expressao -> PAR_OPEN expressao PAR_CLOSE','expressao',3,'p_expressao_paren','parser.py',1142),
+  ('expressao -> expressao OP_ADD expressao','expressao',3,'p_expressao_bin','parser.py',1147),
+  ('expressao -> expressao OP_SUB expressao','expressao',3,'p_expressao_bin','parser.py',1148),
+  ('expressao -> expressao OP_MUL expressao','expressao',3,'p_expressao_bin','parser.py',1149),
+  ('expressao -> expressao OP_DIV OP_BY expressao','expressao',4,'p_expressao_bin','parser.py',1150),
+  ('expressao -> expressao OP_EXP expressao','expressao',3,'p_expressao_bin','parser.py',1151),
+  ('expressao -> expressao KW_AND expressao','expressao',3,'p_expressao_bin','parser.py',1152),
+  ('expressao -> expressao KW_OR expressao','expressao',3,'p_expressao_bin','parser.py',1153),
+  ('expressao -> expressao comp expressao','expressao',3,'p_expressao_bin','parser.py',1154),
+  ('expressao -> KW_NOT expressao','expressao',2,'p_expressao_unararia','parser.py',1167),
+  ('expressao -> OP_INC expressao','expressao',2,'p_expressao_unararia','parser.py',1168),
+  ('expressao -> OP_DEC expressao','expressao',2,'p_expressao_unararia','parser.py',1169),
+  ('expressao -> INT_NUMBER','expressao',1,'p_expressao_valor','parser.py',1178),
+  ('expressao -> FLOAT_NUMBER','expressao',1,'p_expressao_valor','parser.py',1179),
+  ('expressao -> STRING','expressao',1,'p_expressao_valor','parser.py',1180),
+  ('expressao -> TRUE','expressao',1,'p_expressao_valor','parser.py',1181),
+  ('expressao -> FALSE','expressao',1,'p_expressao_valor','parser.py',1182),
+  ('expressao -> IDENTIFIER','expressao',1,'p_expressao_valor','parser.py',1183),
+  ('expressao -> IDENTIFIER BRACKET_OPEN expressao BRACKET_CLOSE','expressao',4,'p_expressao_vetor','parser.py',1199),
+  ('expressao -> func lista_args','expressao',2,'p_expressao_chamada','parser.py',1205),
+  ('expressao -> IDENTIFIER KW_FUNC_OPEN_ARGS lista_args','expressao',3,'p_expressao_chamada','parser.py',1206),
+  ('func -> KW_PRINT','func',1,'p_func','parser.py',1215),
+  ('func -> KW_INPUT','func',1,'p_func','parser.py',1216),
+  ('lista_args -> lista_args KW_FUNC_ARGS_SEP expressao','lista_args',3,'p_lista_args','parser.py',1222),
+  ('lista_args -> expressao','lista_args',1,'p_lista_args','parser.py',1223),
+  ('comp -> KW_IS comp2','comp',2,'p_expressao_comp','parser.py',1232),
+  ('comp2 -> comp3 comp4','comp2',2,'p_expressao_comp2','parser.py',1237),
+  ('comp2 -> comp5','comp2',1,'p_expressao_comp22','parser.py',1242),
+  ('comp2 -> KW_DIFF','comp2',1,'p_expressao_comp22','parser.py',1243),
+  ('comp3 -> KW_GREATER','comp3',1,'p_expressao_comp3','parser.py',1249),
+  ('comp3 -> KW_LESS','comp3',1,'p_expressao_comp3','parser.py',1250),
+  ('comp4 -> KW_THAN','comp4',1,'p_expressao_comp4','parser.py',1255),
+  ('comp4 -> KW_OR comp5','comp4',2,'p_expressao_comp44','parser.py',1260),
+  ('comp5 -> KW_EQUAL KW_TO','comp5',2,'p_expressao_comp5','parser.py',1265),
+]
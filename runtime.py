@@ -0,0 +1,464 @@
+# Suporte de execução para o código gerado pelo compilador. O código gerado
+# importa este módulo como '_tches', um nome que não pode colidir com os
+# identificadores da linguagem.
+
+import io
+import os
+import sys
+import time
+import array
+import atexit
+import bisect
+import functools
+import itertools
+import contextlib
+import collections
+
+
+def range_list(start, stop):
+    # 'lista l é A a B'
+    return list(range(start, stop))
+
+
+class LazyRange:
+    # 'lista l é A a B' que só vira uma lista de verdade na primeira
+    # modificação. Até lá ocupa memória constante.
+    __slots__ = ('_range', '_list')
+
+    def __init__(self, start, stop):
+        self._range = range(start, stop)
+        self._list = None
+
+    def _items(self):
+        if self._list is None:
+            return self._range
+        return self._list
+
+    def _materialize(self):
+        if self._list is None:
+            self._list = list(self._range)
+            self._range = None
+        return self._list
+
+    def __len__(self):
+        return len(self._items())
+
+    def __iter__(self):
+        return iter(self._items())
+
+    def __contains__(self, value):
+        return value in self._items()
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return list(self._items()[index])
+        return self._items()[index]
+
+    def __setitem__(self, index, value):
+        self._materialize()[index] = value
+
+    def __delitem__(self, index):
+        del self._materialize()[index]
+
+    def append(self, value):
+        self._materialize().append(value)
+
+    def sort(self):
+        self._materialize().sort()
+
+    def __eq__(self, other):
+        if isinstance(other, LazyRange):
+            other = list(other._items())
+        return list(self._items()) == other
+
+    def __repr__(self):
+        return repr(list(self._items()))
+
+
+class TypedList(array.array):
+    # 'lista de int' e 'lista de real': elementos guardados lado a lado, sem
+    # um objeto por número
+    __slots__ = ()
+
+    def __new__(cls, typecode, items=()):
+        return super().__new__(cls, typecode, items)
+
+    def __repr__(self):
+        return repr(self.tolist())
+
+
+def typed_range(typecode, start, stop):
+    # 'lista de int l é A a B'
+    return TypedList(typecode, range(start, stop))
+
+
+# Funções pré-definidas ('ordena com l', 'soma com l', ...). Todas aceitam
+# list, LazyRange e TypedList.
+
+def sort(items):
+    if isinstance(items, TypedList):
+        items[:] = TypedList(items.typecode, sorted(items))
+    else:
+        items.sort()
+
+
+def total(items):
+    return sum(items)
+
+
+def maximum(items):
+    return max(items)
+
+
+def minimum(items):
+    return min(items)
+
+
+def length(items):
+    return len(items)
+
+
+def search(items, value):
+    # Busca binária numa lista ordenada; -1 se não encontrar
+    i = bisect.bisect_left(items, value)
+    if i < len(items) and items[i] == value:
+        return i
+    return -1
+
+
+def fill(items, value):
+    if isinstance(items, TypedList):
+        items[:] = TypedList(items.typecode, [value]) * len(items)
+    else:
+        items[:] = [value] * len(items)
+
+
+def copy(items):
+    if isinstance(items, TypedList):
+        return TypedList(items.typecode, items)
+    return list(items)
+
+
+# Saída de 'mostra'. As linhas ficam num buffer e vão para sys.stdout de
+# uma vez: quando o buffer passa de buffer_size caracteres, antes de cada
+# 'leia' (para que a pergunta apareça depois do que já foi mostrado) e ao
+# sair. Quem troca sys.stdout enquanto o programa roda precisa chamar
+# flush() antes de trocar de volta.
+
+def _terminal():
+    try:
+        return sys.stdout.isatty()
+    except (AttributeError, ValueError):
+        return False
+
+
+# Caracteres guardados antes de escrever; 0 escreve a cada 'mostra'. No
+# terminal cada linha aparece assim que é mostrada.
+buffer_size = 0 if _terminal() else 64 * 1024
+_buffer = []
+_buffered = 0
+
+
+def show(*values):
+    global _buffered
+    if len(values) == 1:
+        linha = str(values[0])
+    else:
+        linha = ' '.join(map(str, values))
+    _buffer.append(linha)
+    _buffered += len(linha) + 1
+    if _buffered >= buffer_size:
+        flush()
+
+
+def read(*prompt):
+    flush()
+    return input(*prompt)
+
+
+def flush():
+    global _buffered
+    if _buffer:
+        _buffer.append('')
+        texto = '\n'.join(_buffer)
+        _buffer.clear()
+        _buffered = 0
+        sys.stdout.write(texto)
+    sys.stdout.flush()
+
+
+atexit.register(flush)
+
+
+# Funções 'define memorizado'. Os resultados ficam num cache LRU por
+# função; os argumentos do tipo lista viram tuplas para servir de chave.
+
+# Resultados guardados por função
+memo_size = 1024
+# (nome, linha) -> função com cache, para as estatísticas
+memo_functions = {}
+
+
+def memoized(name, lineno, list_args=()):
+    def decorator(func):
+        cached = functools.lru_cache(maxsize=memo_size)(func)
+        memo_functions[(name, lineno)] = cached
+        if not list_args:
+            return cached
+
+        @functools.wraps(func)
+        def wrapper(*args):
+            args = list(args)
+            for i in list_args:
+                args[i] = tuple(args[i])
+            return cached(*args)
+        return wrapper
+    return decorator
+
+
+# Laços 'para cada v em l em paralelo faça'. O corpo do laço chega aqui como
+# uma função que recebe uma lista de elementos. Os processos são criados
+# com fork, então herdam essa função e os valores atuais das variáveis que
+# ela lê, sem precisar serializar nada além dos elementos.
+
+# Quantidade de processos; None usa um por núcleo
+workers = None
+# Pedaços por processo, para equilibrar corpos de custo desigual
+CHUNKS_PER_WORKER = 4
+_body = None
+_in_worker = False
+
+
+def _start_worker():
+    global _in_worker
+    # Laços paralelos dentro de um laço paralelo rodam em sequência
+    _in_worker = True
+
+
+def _run_chunk(chunk):
+    saida = io.StringIO()
+    with contextlib.redirect_stdout(saida):
+        try:
+            valores = _body(chunk)
+        finally:
+            flush()
+    return valores, saida.getvalue()
+
+
+def parallel_for(body, items, write_back):
+    global _body
+    # Importados só aqui: os programas sem laço paralelo (e os gerados pelo
+    # build.py) não pagam por eles ao iniciar
+    import multiprocessing
+    import concurrent.futures
+    itens = list(items)
+    n = workers or os.cpu_count() or 1
+    if _in_worker or n < 2 or len(itens) < 2 or 'fork' not in multiprocessing.get_all_start_methods():
+        valores = body(itens)
+    else:
+        n = min(n, len(itens))
+        tamanho = -(-len(itens) // (n * CHUNKS_PER_WORKER))
+        pedacos = [itens[i:i + tamanho] for i in range(0, len(itens), tamanho)]
+        # Os processos herdam o buffer; ele precisa estar vazio para que as
+        # linhas já mostradas não se repitam na saída dos pedaços
+        flush()
+        anterior = _body
+        _body = body
+        try:
+            contexto = multiprocessing.get_context('fork')
+            with concurrent.futures.ProcessPoolExecutor(n, mp_context=contexto,
+                                                        initializer=_start_worker) as executor:
+                tarefas = [executor.submit(_run_chunk, pedaco) for pedaco in pedacos]
+                valores = [] if write_back else None
+                # A saída de cada pedaço é mostrada na ordem da lista
+                for tarefa in tarefas:
+                    parte, saida = tarefa.result()
+                    sys.stdout.write(saida)
+                    if write_back:
+                        valores.extend(parte)
+        finally:
+            _body = anterior
+
+    if write_back:
+        store_values(items, valores)
+
+
+def store_values(items, valores):
+    # Valores finais da variável do laço de volta para a lista
+    if isinstance(items, TypedList):
+        items[:] = TypedList(items.typecode, valores)
+    else:
+        items[:] = valores
+
+
+# Limites de execução (--limite-passos, --limite-tempo, --limite-memoria).
+# O código gerado chama next(_passos) no começo de cada volta de laço e de
+# cada chamada de função. _passos é um iterador do itertools que só volta
+# para o Python a cada BUDGET_INTERVAL passos, para conferir os limites; nas
+# outras vezes o passo não sai do C.
+
+class BudgetExceeded(Exception):
+    pass
+
+
+BUDGET_INTERVAL = 1000
+MB = 1024 * 1024
+_steps = None
+_memory_limit = None
+# Limite de memória do processo antes do programa, para restaurar
+_previous_limit = None
+
+
+def budget(steps=None, seconds=None, memory=None):
+    # Chamado no começo do programa (em cada comando, no modo por comando):
+    # o primeiro chamado inicia a contagem e os outros a continuam
+    global _steps
+    if _steps is None:
+        _limit_memory(memory)
+        _steps = itertools.chain.from_iterable(_budget_chunks(steps, seconds, time.perf_counter()))
+    return _steps
+
+
+def budget_steps(n):
+    # n passos de uma vez, na entrada de um laço com número de voltas
+    # conhecido ('enquanto' que virou range()); consumidos em C
+    if n > 0:
+        collections.deque(itertools.islice(_steps, n), maxlen=0)
+
+
+def end_budget():
+    global _steps, _memory_limit, _previous_limit
+    _steps = None
+    _memory_limit = None
+    if _previous_limit is not None:
+        import resource
+        resource.setrlimit(resource.RLIMIT_AS, _previous_limit)
+        _previous_limit = None
+
+
+def _budget_chunks(steps, seconds, inicio):
+    restantes = steps
+    while True:
+        if seconds is not None and time.perf_counter() - inicio > seconds:
+            raise BudgetExceeded('limite de tempo de {} s excedido{}'.format(seconds, _where()))
+        if restantes is None:
+            yield itertools.repeat(None, BUDGET_INTERVAL)
+        elif restantes <= 0:
+            raise BudgetExceeded('limite de {} passos excedido{}'.format(steps, _where()))
+        else:
+            n = min(restantes, BUDGET_INTERVAL)
+            restantes -= n
+            yield itertools.repeat(None, n)
+
+
+def _where():
+    # Linha do laço ou da função que deu o passo: o primeiro quadro fora
+    # deste módulo. O gerador é retomado pelo chain, em C, então os quadros
+    # anteriores são os de quem pediu o passo.
+    frame = sys._getframe(1)
+    while frame is not None and frame.f_globals is globals():
+        frame = frame.f_back
+    return _line(frame.f_lineno if frame is not None else None)
+
+
+def _line(lineno):
+    return ' na linha {}'.format(lineno) if lineno else ''
+
+
+def _limit_memory(memory):
+    # Limita o espaço de endereçamento a memory bytes além do que o processo
+    # já usa; uma alocação além disso vira MemoryError
+    global _memory_limit, _previous_limit
+    if memory is None:
+        return
+    try:
+        import resource
+        with open('/proc/self/statm') as f:
+            atual = int(f.read().split()[0]) * os.sysconf('SC_PAGE_SIZE')
+    except (ImportError, OSError, ValueError):
+        # Sistema sem /proc ou sem setrlimit: roda sem limite de memória
+        return
+    anterior = resource.getrlimit(resource.RLIMIT_AS)
+    limite = atual + memory
+    if anterior[1] != resource.RLIM_INFINITY:
+        limite = min(limite, anterior[1])
+    resource.setrlimit(resource.RLIMIT_AS, (limite, anterior[1]))
+    _memory_limit = memory
+    _previous_limit = anterior
+
+
+def budget_error(exc, filename):
+    # O BudgetExceeded correspondente a exc, ou None. Um MemoryError só conta
+    # como limite excedido se há um limite de memória; a linha é a do último
+    # quadro do programa no traceback.
+    if isinstance(exc, BudgetExceeded):
+        return exc
+    if isinstance(exc, MemoryError) and _memory_limit is not None:
+        linha = None
+        tb = exc.__traceback__
+        while tb is not None:
+            if tb.tb_frame.f_code.co_filename == filename:
+                linha = tb.tb_lineno
+            tb = tb.tb_next
+        return BudgetExceeded('limite de memória de {} MB excedido{}'.format(_memory_limit // MB, _line(linha)))
+    return None
+
+
+# Perfil de execução (--profile)
+
+# (nome, linha) -> [chamadas, tempo acumulado]
+function_stats = {}
+# (laço, linha) -> iterações
+loop_counts = collections.Counter()
+_profiling = False
+
+
+def start_profile():
+    global _profiling
+    if not _profiling:
+        _profiling = True
+        atexit.register(profile_report)
+
+
+def profiled(name, lineno):
+    # Decorador das funções 'define'. O tempo só é medido na chamada mais
+    # externa, para que a recursão não seja contada várias vezes.
+    def decorator(func):
+        stats = function_stats.setdefault((name, lineno), [0, 0.0])
+        ativas = [0]
+
+        @functools.wraps(func)
+        def wrapper(*args):
+            stats[0] += 1
+            if ativas[0]:
+                return func(*args)
+            ativas[0] += 1
+            inicio = time.perf_counter()
+            try:
+                return func(*args)
+            finally:
+                stats[1] += time.perf_counter() - inicio
+                ativas[0] -= 1
+        return wrapper
+    return decorator
+
+
+def profile_report(file=None, limite=10):
+    file = file or sys.stderr
+    funcoes = sorted(function_stats.items(), key=lambda item: item[1][1], reverse=True)
+    print('\nFunções (por tempo total):', file=file)
+    print('{:>6}  {:<20} {:>10} {:>12}'.format('linha', 'função', 'chamadas', 'tempo (ms)'), file=file)
+    for (name, lineno), (chamadas, tempo) in funcoes[:limite]:
+        print('{:>6}  {:<20} {:>10} {:>12.3f}'.format(lineno, name, chamadas, tempo * 1e3), file=file)
+
+    if memo_functions:
+        print('\nFunções memorizadas:', file=file)
+        print('{:>6}  {:<20} {:>10} {:>10} {:>10}'.format('linha', 'função', 'acertos', 'faltas', 'guardados'), file=file)
+        for (name, lineno), cached in sorted(memo_functions.items(), key=lambda item: item[0][1]):
+            info = cached.cache_info()
+            print('{:>6}  {:<20} {:>10} {:>10} {:>10}'.format(lineno, name, info.hits, info.misses, info.currsize), file=file)
+
+    print('\nLaços (por iterações):', file=file)
+    print('{:>6}  {:<20} {:>10}'.format('linha', 'laço', 'iterações'), file=file)
+    for (kind, lineno), iteracoes in loop_counts.most_common(limite):
+        print('{:>6}  {:<20} {:>10}'.format(lineno, kind, iteracoes), file=file)
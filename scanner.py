@@ -1,5 +1,11 @@
 from ply import lex
+import io
+import os
+import re
 import sys
+import array
+import itertools
+import contextlib
 
 reserved = {
     'mais' : 'OP_ADD',
@@ -20,6 +26,7 @@ reserved = {
     'real' : 'KW_FLOAT',
     'texto' : 'KW_STRING',
     'lista' : 'KW_LIST',
+    'de' : 'KW_OF',
     'mostra' : 'KW_PRINT',
     'leia' : 'KW_INPUT',
     'verdadeiro' : 'TRUE',
@@ -42,7 +49,10 @@ reserved = {
     'tá' : 'KW_ITS',
     'bom' : 'KW_OK',
     'bota' : 'KW_PUT',
-    'em' : 'KW_IN'
+    'em' : 'KW_IN',
+    'cada' : 'KW_EACH',
+    'paralelo' : 'KW_PARALLEL',
+    'memorizado' : 'KW_MEMO'
 }
 
 tokens = [
@@ -118,7 +128,199 @@ t_ignore = ' \t'
 #t_ignore_COMMENT = r'\#.*'
 
 
-lexer = lex.lex()
+# Diretório das tabelas pré-geradas (lextab.py e parsetab.py)
+TABELAS = os.path.dirname(os.path.abspath(__file__))
+
+# Carrega a tabela lextab.py em vez de refletir e validar as regras a cada
+# execução. Depois de mudar os tokens, rode "parser.py --gera-tabelas".
+lexer = lex.lex(optimize=1, lextab='lextab', outputdir=TABELAS)
+
+
+# Varredura rápida, sem uma chamada de função Python por token. As regras
+# acima viram uma expressão regular só, na mesma ordem em que o PLY as
+# combina (funções na ordem em que foram definidas, depois as strings da
+# maior para a menor), com os espaços ignorados no começo de cada token e
+# um caractere qualquer no fim, que é o erro. O findall() corta o texto
+# inteiro em C; o tipo de cada pedaço vem de um dicionário (os mesmos
+# textos se repetem muito) e o início de cada um da soma dos tamanhos.
+# Os objetos Token só são criados quando o parser pede.
+
+NEW_LINE = 'NEW_LINE'
+COMMENT = 'COMMENT'
+ILLEGAL_CHAR = 'ILLEGAL_CHAR'
+ILLEGAL_FLOAT = 'ILLEGAL_FLOAT'
+
+# Tipos de token, pela posição no array de tipos
+KINDS = tokens + [NEW_LINE, COMMENT, ILLEGAL_CHAR, ILLEGAL_FLOAT]
+KIND_INDEX = {kind: i for i, kind in enumerate(KINDS)}
+IGNORED = (KIND_INDEX[NEW_LINE], KIND_INDEX[COMMENT], KIND_INDEX[ILLEGAL_CHAR], KIND_INDEX[ILLEGAL_FLOAT])
+# Tipos que não são só o texto do token
+CONVERTED = frozenset(IGNORED + (KIND_INDEX['STRING'], KIND_INDEX['FLOAT_NUMBER'], KIND_INDEX['INT_NUMBER']))
+
+_regras = [
+    ('IDENTIFIER', t_IDENTIFIER.__doc__),
+    ('STRING', t_STRING.__doc__),
+    # O PLY descarta também o caractere seguinte (t.lexer.skip(1) depois do
+    # fim do token), mesmo que seja uma quebra de linha
+    (ILLEGAL_FLOAT, t_float_error.__doc__.replace('(', '(?:') + '[\\s\\S]?'),
+    ('FLOAT_NUMBER', t_FLOAT_NUMBER.__doc__),
+    ('INT_NUMBER', t_INT_NUMBER.__doc__),
+    (NEW_LINE, t_NEW_LINE.__doc__),
+    (COMMENT, t_COMMENT.__doc__),
+    ('PAR_OPEN', t_PAR_OPEN),
+    ('PAR_CLOSE', t_PAR_CLOSE),
+    ('BRACKET_OPEN', t_BRACKET_OPEN),
+    ('BRACKET_CLOSE', t_BRACKET_CLOSE),
+    ('KW_FPUNC', t_KW_FPUNC),
+    ('KW_FUNC_ARGS_SEP', t_KW_FUNC_ARGS_SEP),
+    # Espaços no fim do texto não são erro
+    (ILLEGAL_CHAR, '[^{}]'.format(t_ignore)),
+]
+MASTER = re.compile('[{}]*(?:{})'.format(t_ignore, '|'.join(regex for name, regex in _regras)), re.VERBOSE)
+_regras = [(name, re.compile(regex, re.VERBOSE)) for name, regex in _regras]
+_float_error = re.compile(t_float_error.__doc__, re.VERBOSE)
+
+
+class _Kinds(dict):
+    # Texto de um pedaço -> índice do tipo. Começa com as palavras reservadas
+    # e a pontuação; os textos novos são classificados pela primeira regra
+    # que casa, como no PLY.
+    def __missing__(self, text):
+        stripped = text.lstrip(t_ignore)
+        for name, regex in _regras:
+            if regex.match(stripped):
+                break
+        if name == 'IDENTIFIER':
+            name = reserved.get(stripped, name)
+        self[text] = kind = KIND_INDEX[name]
+        return kind
+
+
+_KNOWN = _Kinds()
+for _texto in list(reserved) + ['(', ')', '[', ']', '.', ',', '\n']:
+    _KNOWN[_texto]
+
+
+class Token:
+    # Mesmos campos do LexToken do PLY; 'lexer' é preenchido pelo parser
+    # quando o token causa um erro de sintaxe
+    __slots__ = ('type', 'value', 'lineno', 'lexpos', 'lexer')
+
+    def __init__(self, type, value, lineno, lexpos):
+        self.type = type
+        self.value = value
+        self.lineno = lineno
+        self.lexpos = lexpos
+
+    def __repr__(self):
+        return 'LexToken({},{!r},{:d},{:d})'.format(self.type, self.value, self.lineno, self.lexpos)
+
+
+class Tokens:
+    # kinds: bytes com o índice do tipo de cada pedaço
+    # offsets: array com o início de cada pedaço e o fim do último
+    __slots__ = ('data', 'kinds', 'offsets', 'lineno', '_tokens')
+
+    def __init__(self, data, kinds, offsets, lineno):
+        self.data = data
+        self.kinds = kinds
+        self.offsets = offsets
+        self.lineno = lineno
+        self._tokens = None
+
+    def __len__(self):
+        return len(self.kinds)
+
+    def positions(self):
+        # (tipo, início) dos tokens, sem criar os objetos e sem mensagens
+        data = self.data
+        offsets = self.offsets
+        for i, kind in enumerate(self.kinds):
+            if kind not in IGNORED:
+                start = offsets[i]
+                end = offsets[i + 1]
+                yield KINDS[kind], end - len(data[start:end].lstrip(t_ignore))
+
+    def tokens(self):
+        # Os erros léxicos são mostrados quando a leitura passa por eles, na
+        # mesma ordem que no PLY
+        data = self.data
+        lineno = self.lineno
+        fins = itertools.islice(self.offsets, 1, None)
+        for kind, start, end in zip(self.kinds, self.offsets, fins):
+            text = data[start:end].lstrip(t_ignore)
+            if kind not in CONVERTED:
+                yield Token(KINDS[kind], text, lineno, end - len(text))
+                continue
+            kind = KINDS[kind]
+            if kind == NEW_LINE:
+                lineno += len(text)
+                continue
+            elif kind == COMMENT:
+                continue
+            elif kind == ILLEGAL_CHAR:
+                print('Caractere ilegal: {} na linha {}'.format(text, lineno))
+                continue
+            elif kind == ILLEGAL_FLOAT:
+                print('Token ilegal: {} na linha {}'.format(_float_error.match(text).group(), lineno))
+                continue
+            elif kind == 'STRING':
+                value = text[1:-1]
+            elif kind == 'FLOAT_NUMBER':
+                value = float(text.replace(',', '.'))
+            else:
+                value = int(text)
+            yield Token(kind, value, lineno, end - len(text))
+
+    def token(self):
+        # Próximo token, como o lexer.token() do PLY. Serve de tokenfunc
+        # para o parser.parse().
+        if self._tokens is None:
+            self._tokens = self.tokens()
+        return next(self._tokens, None)
+
+
+def scan(data, lineno=1):
+    pedacos = MASTER.findall(data)
+    kinds = bytes(map(_Kinds(_KNOWN).__getitem__, pedacos))
+    offsets = array.array('q', itertools.accumulate(map(len, pedacos), initial=0))
+    # O findall() pula os espaços do fim, que não estão em nenhum pedaço
+    return Tokens(data, kinds, offsets, lineno)
+
+
+def _events(token):
+    # Tokens e mensagens de erro, na ordem em que aparecem
+    events = []
+    saida = io.StringIO()
+    with contextlib.redirect_stdout(saida):
+        while True:
+            tok = token()
+            if saida.tell():
+                events.append(('mensagem', saida.getvalue()))
+                saida.seek(0)
+                saida.truncate()
+            if not tok:
+                break
+            events.append((tok.type, tok.value, tok.lineno, tok.lexpos))
+    return events
+
+
+def compare(data, lineno=1):
+    # Compara scan() com o lexer do PLY. Retorna None se os tokens e as
+    # mensagens são iguais, ou a posição e os dois eventos da primeira
+    # diferença.
+    ply = lexer.clone()
+    ply.lineno = lineno
+    ply.input(data)
+    esperado = _events(ply.token)
+    obtido = _events(scan(data, lineno).token)
+    for i, (a, b) in enumerate(zip(esperado, obtido)):
+        if a != b:
+            return i, a, b
+    if len(esperado) != len(obtido):
+        i = min(len(esperado), len(obtido))
+        return i, esperado[i:i + 1], obtido[i:i + 1]
+    return None
 
 
 if __name__ == "__main__":
@@ -128,10 +330,10 @@ if __name__ == "__main__":
         file = open(sys.argv[1], 'r')
         data = file.read();
 
-        lexer.input(data)
+        tokens = scan(data)
 
         while True:
-            token = lexer.token()
+            token = tokens.token()
             if not token:
                 break
             print(token)
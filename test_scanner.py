@@ -0,0 +1,73 @@
+import os
+import random
+import unittest
+
+import scanner
+
+# O scan() baseado em findall precisa gerar os mesmos tokens, linhas,
+# posições e mensagens de erro que o lexer do PLY. Roda com
+# python -m unittest (ou pytest) a partir da raiz do projeto.
+
+EXEMPLOS = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'exemplos')
+
+# Casos difíceis: acentos, números colados em identificadores, números com
+# vírgula, strings sem fim, comentários, caracteres ilegais e quebras de linha
+CASOS = [
+    '',
+    'int ação é 1.\nmostra ação.\n',
+    'texto é "não então é".\nmostra é.',
+    'Я я ÿ é\n',
+    'x1 1x 12abc abc12 1,5x x1,5\n',
+    '1,2,3 1,,2 4,5. 0,0 ,5 5,\n',
+    'mostra "sem fim\nmostra 1.\n',
+    "mostra 'sem fim",
+    '"',
+    '"a b" \'c\' "d\'e"\n',
+    '# comentário\nx é 1. # outro\n#',
+    '@ $ { ~ [ ]\n',
+    'x é 1.\r\ny é 2.\r\n',
+    '\n\n\t  \n',
+]
+
+
+class CompareTest(unittest.TestCase):
+
+    def assertSame(self, data, lineno=1):
+        diferenca = scanner.compare(data, lineno)
+        if diferenca is not None:
+            self.fail('{!r}: token {} difere: PLY {} / scan {}'.format(data[:60], *diferenca))
+
+    def test_exemplos(self):
+        for nome in sorted(os.listdir(EXEMPLOS)):
+            caminho = os.path.join(EXEMPLOS, nome)
+            if not os.path.isfile(caminho):
+                continue
+            with open(caminho) as f:
+                data = f.read()
+            with self.subTest(nome):
+                self.assertSame(data)
+
+    def test_casos(self):
+        for data in CASOS:
+            with self.subTest(data):
+                self.assertSame(data)
+
+    def test_lineno(self):
+        # O modo por comando começa a varredura no meio do programa
+        for data in CASOS:
+            with self.subTest(data):
+                self.assertSame(data, 10)
+
+    def test_aleatorio(self):
+        pedacos = ['mais', 'x', 'é', 'não', 'então', '1', '23', '4,5', '1,2,3', '1,,2', ',', '.',
+                   '"a b"', "'c'", '"', '#', '# nota', '(', ')', '[', ']', '@', '$', '\r', '\n',
+                   '\n\n', ' ', '\t', 'ação', 'x1', 'Z', '{', '~', 'ÿ', 'Я', 'я', '0']
+        rng = random.Random(0)
+        for _ in range(200):
+            data = ''.join(rng.choice(pedacos) for _ in range(rng.randrange(1, 80)))
+            with self.subTest(data):
+                self.assertSame(data)
+
+
+if __name__ == '__main__':
+    unittest.main()